@@ -15,7 +15,7 @@ parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__f
 if parent_dir not in sys.path:
     sys.path.insert(0, parent_dir)
 from Trees.base_tree_visualization import BaseTreeVisualization
-from Trees.utils import create_circular_node, create_edge_circular_nodes
+from Trees.utils import create_circular_node, create_edge_circular_nodes, make_text
 
 class AVLTreeVisualization(BaseTreeVisualization):
     
@@ -100,6 +100,6 @@ class AVLTreeVisualization(BaseTreeVisualization):
         """Create an AVL tree node with balance factor"""
         base_node = create_circular_node(value, position)
         circle = base_node[0]
-        bf_text = Text(f"bf={bf}", font_size=16, color=YELLOW).next_to(circle, DOWN, buff=0.1)
+        bf_text = make_text(f"bf={bf}", font_size=16, color=YELLOW).next_to(circle, DOWN, buff=0.1)
         return VGroup(*base_node, bf_text)
 
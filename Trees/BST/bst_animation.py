@@ -87,7 +87,7 @@ class BSTVisualization(BaseTreeVisualization):
                     if nid in prev_nodes:
                         node_mobj = prev_nodes[nid]
                         is_leaf_position = (i == len(insertion_path) - 1)
-                        node_key = builder._nodes[nid].key
+                        node_key = prev_state.nodes[nid].key
                         
                         # Highlight current node
                         self.play(
@@ -134,7 +134,8 @@ class BSTVisualization(BaseTreeVisualization):
                 self.play(Create(tree_group), run_time=1.0)
             else:
                 prev_nodes, prev_edges = animate_bst_transition(
-                    self, prev_state, new_state, prev_nodes, prev_edges, run_time=1.0
+                    self, prev_state, new_state, prev_nodes, prev_edges, run_time=1.0,
+                    diff=builder.last_diff,
                 )
             
             prev_state = new_state
@@ -184,7 +185,7 @@ class BSTVisualization(BaseTreeVisualization):
         for i, nid in enumerate(search_path):
             if nid in prev_nodes:
                 node_mobj = prev_nodes[nid]
-                node_key = builder._nodes[nid].key
+                node_key = prev_state.nodes[nid].key
                 is_found = (node_key == search_val)
                 
                 self.play(
@@ -214,7 +215,7 @@ class BSTVisualization(BaseTreeVisualization):
         
         # Reset found node color
         for nid in search_path:
-            if nid in prev_nodes and builder._nodes[nid].key == search_val:
+            if nid in prev_nodes and prev_state.nodes[nid].key == search_val:
                 self.play(prev_nodes[nid][0].animate.set_color(BLUE), run_time=0.3)
         
         # 7. Complexity summary
@@ -289,7 +290,7 @@ class BSTVisualization(BaseTreeVisualization):
         for i, nid in enumerate(search_path):
             if nid in prev_nodes:
                 node_mobj = prev_nodes[nid]
-                node_key = builder._nodes[nid].key
+                node_key = prev_state.nodes[nid].key
                 is_target = (node_key == val)
                 
                 self.play(
@@ -307,13 +308,13 @@ class BSTVisualization(BaseTreeVisualization):
                     # If showing successor (two children case), highlight it
                     if show_successor:
                         # Find inorder successor (leftmost in right subtree)
-                        target_node = builder._nodes[nid]
+                        target_node = prev_state.nodes[nid]
                         if target_node.right is not None:
                             successor_id = target_node.right
-                            successor = builder._nodes[successor_id]
+                            successor = prev_state.nodes[successor_id]
                             while successor.left is not None:
                                 successor_id = successor.left
-                                successor = builder._nodes[successor_id]
+                                successor = prev_state.nodes[successor_id]
                             
                             if successor_id in prev_nodes:
                                 successor_text = Text(f"Successor: {successor.key}", font_size=14, color=GREEN, disable_ligatures=True)
@@ -343,7 +344,8 @@ class BSTVisualization(BaseTreeVisualization):
         
         # Animate transition
         new_nodes, new_edges = animate_bst_transition(
-            self, prev_state, new_state, prev_nodes, prev_edges, run_time=1.0
+            self, prev_state, new_state, prev_nodes, prev_edges, run_time=1.0,
+            diff=builder.last_diff,
         )
         
         self.update_explainer(f"Deleted {val}", GREEN)
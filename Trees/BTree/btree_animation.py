@@ -84,7 +84,7 @@ class BTreeVisualization(BaseTreeVisualization):
             self.wait(0.2)
             
             # Get tree state before insert to detect splits
-            old_node_count = len(builder._nodes) if builder._root_id is not None else 0
+            old_node_count = len(prev_state.nodes) if prev_state is not None else 0
             
             # If tree exists, show step-by-step traversal to find insertion point
             if prev_state is not None and prev_nodes is not None:
@@ -109,7 +109,7 @@ class BTreeVisualization(BaseTreeVisualization):
                             self.update_explainer(f"Found leaf!\nInsert {val} here", GREEN)
                         else:
                             # Show comparison
-                            node_keys = builder._nodes[nid].keys
+                            node_keys = prev_state.nodes[nid].keys
                             if val < node_keys[0]:
                                 self.update_explainer(f"{val} < {node_keys[0]}\nGo left", WHITE)
                             elif len(node_keys) > 1 and val > node_keys[-1]:
@@ -156,7 +156,8 @@ class BTreeVisualization(BaseTreeVisualization):
             else:
                 # Use localized transition - only animates changed parts
                 prev_nodes, prev_edges = animate_btree_transition(
-                    self, prev_state, new_state, prev_nodes, prev_edges, run_time=1.0
+                    self, prev_state, new_state, prev_nodes, prev_edges, run_time=1.0,
+                    diff=builder.last_diff,
                 )
             
             prev_state = new_state
@@ -206,7 +207,7 @@ class BTreeVisualization(BaseTreeVisualization):
             )
             
             # Check if key is in this node
-            node_keys = builder._nodes[nid].keys
+            node_keys = prev_state.nodes[nid].keys
             if search_val in node_keys:
                 found = True
                 key_idx = node_keys.index(search_val)
@@ -0,0 +1,191 @@
+"""
+Red-black tree insertion core for the Red-Black tree visualization
+Array-based (structure-of-arrays) simulation with no Manim dependencies,
+JIT-compiled with Numba when it is installed
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # Numba is optional - fall back to plain Python
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+NIL = -1
+SKIPPED = -2  # parent marker for duplicate keys that were not inserted
+
+RED = 0
+BLACK = 1
+
+# Fixup actions recorded per insertion step
+ACTION_RECOLOR_RED = 0
+ACTION_RECOLOR_BLACK = 1
+ACTION_ROTATE_LEFT = 2
+ACTION_ROTATE_RIGHT = 3
+
+
+@njit(cache=True)
+def _rotate_left(left, right, parent, x, root):
+    """Left rotation around x. Returns the (possibly new) root."""
+    y = right[x]
+    right[x] = left[y]
+    if left[y] != NIL:
+        parent[left[y]] = x
+    parent[y] = parent[x]
+    if parent[x] == NIL:
+        root = y
+    elif x == left[parent[x]]:
+        left[parent[x]] = y
+    else:
+        right[parent[x]] = y
+    left[y] = x
+    parent[x] = y
+    return root
+
+
+@njit(cache=True)
+def _rotate_right(left, right, parent, x, root):
+    """Right rotation around x. Returns the (possibly new) root."""
+    y = left[x]
+    left[x] = right[y]
+    if right[y] != NIL:
+        parent[right[y]] = x
+    parent[y] = parent[x]
+    if parent[x] == NIL:
+        root = y
+    elif x == right[parent[x]]:
+        right[parent[x]] = y
+    else:
+        left[parent[x]] = y
+    right[y] = x
+    parent[x] = y
+    return root
+
+
+@njit(cache=True)
+def insert_fixup(color, parent, left, right, z, root, step, events):
+    """
+    Restore red-black properties after inserting red node z.
+
+    Written as an explicit loop walking up the parent array rather than
+    the textbook recursion. Appends (step, node, action) to events and
+    returns the (possibly new) root.
+    """
+    while z != root and color[parent[z]] == RED:
+        p = parent[z]
+        g = parent[p]
+        if p == left[g]:
+            u = right[g]
+            if u != NIL and color[u] == RED:
+                color[p] = BLACK
+                color[u] = BLACK
+                color[g] = RED
+                events.append((step, p, ACTION_RECOLOR_BLACK))
+                events.append((step, u, ACTION_RECOLOR_BLACK))
+                events.append((step, g, ACTION_RECOLOR_RED))
+                z = g
+            else:
+                if z == right[p]:
+                    z = p
+                    root = _rotate_left(left, right, parent, z, root)
+                    events.append((step, z, ACTION_ROTATE_LEFT))
+                    p = parent[z]
+                color[p] = BLACK
+                color[g] = RED
+                events.append((step, p, ACTION_RECOLOR_BLACK))
+                events.append((step, g, ACTION_RECOLOR_RED))
+                root = _rotate_right(left, right, parent, g, root)
+                events.append((step, g, ACTION_ROTATE_RIGHT))
+        else:
+            u = left[g]
+            if u != NIL and color[u] == RED:
+                color[p] = BLACK
+                color[u] = BLACK
+                color[g] = RED
+                events.append((step, p, ACTION_RECOLOR_BLACK))
+                events.append((step, u, ACTION_RECOLOR_BLACK))
+                events.append((step, g, ACTION_RECOLOR_RED))
+                z = g
+            else:
+                if z == left[p]:
+                    z = p
+                    root = _rotate_right(left, right, parent, z, root)
+                    events.append((step, z, ACTION_ROTATE_RIGHT))
+                    p = parent[z]
+                color[p] = BLACK
+                color[g] = RED
+                events.append((step, p, ACTION_RECOLOR_BLACK))
+                events.append((step, g, ACTION_RECOLOR_RED))
+                root = _rotate_left(left, right, parent, g, root)
+                events.append((step, g, ACTION_ROTATE_LEFT))
+
+    if color[root] == RED:
+        color[root] = BLACK
+        events.append((step, root, ACTION_RECOLOR_BLACK))
+
+    return root
+
+
+@njit(cache=True)
+def simulate_inserts(vals):
+    """
+    Insert vals in order into a red-black tree. Node i holds vals[i].
+
+    Args:
+        vals: 1-D int64 array of keys in insertion order
+
+    Returns:
+        Tuple (parents, colors, left, right, root, events):
+        - parents: parent node of each node at insertion time
+          (NIL for the first root, SKIPPED for duplicate keys)
+        - colors: final color of each node (RED/BLACK)
+        - left, right: final child links (NIL if absent)
+        - root: final root node
+        - events: list of (step, node, action) fixup operations in order
+    """
+    n = vals.shape[0]
+    left = np.full(n, NIL, np.int64)
+    right = np.full(n, NIL, np.int64)
+    parent = np.full(n, NIL, np.int64)
+    color = np.full(n, RED, np.int64)
+    parents = np.full(n, NIL, np.int64)
+    events = [(0, 0, 0)]
+    events.pop()
+    root = NIL
+
+    for i in range(n):
+        key = vals[i]
+
+        # BST descent to the insertion point
+        p = NIL
+        cur = root
+        duplicate = False
+        while cur != NIL:
+            p = cur
+            if key < vals[cur]:
+                cur = left[cur]
+            elif key > vals[cur]:
+                cur = right[cur]
+            else:
+                duplicate = True
+                break
+        if duplicate:
+            parents[i] = SKIPPED
+            color[i] = BLACK
+            continue
+
+        parent[i] = p
+        parents[i] = p
+        if p == NIL:
+            root = i
+        elif key < vals[p]:
+            left[p] = i
+        else:
+            right[p] = i
+
+        root = insert_fixup(color, parent, left, right, i, root, i, events)
+
+    return parents, color, left, right, root, events
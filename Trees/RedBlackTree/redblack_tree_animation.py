@@ -6,19 +6,29 @@ Run with: manim -pql redblack_tree_animation.py RedBlackTreeVisualization
 For high quality: manim -pqh redblack_tree_animation.py RedBlackTreeVisualization
 """
 
-from manim import *
+from manim import (
+    Circle, Text, VGroup, Create, Write, FadeOut, MoveToTarget,
+    ORIGIN, UP, DOWN, LEFT, UL, WHITE, BLACK, RED, GREEN, YELLOW, BLUE, GOLD,
+)
 import numpy as np
 import sys
-import os
-# Add parent directory to path for utils import
-parent_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-if parent_dir not in sys.path:
-    sys.path.insert(0, parent_dir)
+from itertools import islice
+from pathlib import Path
+# Add parent directory to path for utils import (resolved once at import)
+_PARENT_DIR = str(Path(__file__).resolve().parents[2])
+if _PARENT_DIR not in sys.path:
+    sys.path.insert(0, _PARENT_DIR)
 from Trees.base_tree_visualization import BaseTreeVisualization
-from Trees.utils import create_circular_node, create_edge_circular_nodes
+from Trees.utils import create_edge_circular_nodes, calculate_binary_tree_position, make_text
+from Trees.RedBlackTree.rb_core import (
+    simulate_inserts, NIL, SKIPPED, ACTION_RECOLOR_RED, ACTION_RECOLOR_BLACK,
+)
 
 class RedBlackTreeVisualization(BaseTreeVisualization):
     
+    # Circle prototypes keyed by is_red; nodes copy these instead of rebuilding the curve
+    _circle_protos = {}
+    
     def construct(self):
         # Title - keep visible throughout
         title = self.create_title_section("Red-Black Trees")
@@ -38,7 +48,7 @@ class RedBlackTreeVisualization(BaseTreeVisualization):
         left_text = Text("3", font_size=24, color=WHITE).move_to(left)
         left_node = VGroup(left, left_text).move_to(ORIGIN + LEFT * 1.5 + DOWN * 0.5)
         
-        edge = create_edge_circular_nodes(root_node, left_node)
+        edge = create_edge_circular_nodes(root_node, left_node, line=self.acquire_edge())
         
         label = Text("Black height balanced", font_size=20, color=GREEN).next_to(root_node, UP)
         
@@ -46,59 +56,101 @@ class RedBlackTreeVisualization(BaseTreeVisualization):
         self.wait(1)
         
         self.fade_out_group(property_section, root_node, left_node, edge, label)
+        self.release_edge(edge)
         
         # Insert elements: [7, 3, 18, 10, 22, 8, 11, 26]
         insert_sequence = [7, 3, 18, 10, 22, 8, 11, 26]
+        # Run the tree logic once up front; the scene only replays its results
+        rb_parents, _, _, _, _, rb_events = simulate_inserts(np.array(insert_sequence, dtype=np.int64))
+        shown_steps = [step for step in range(4) if rb_parents[step] != SKIPPED]  # Show first few insertions
+        
+        # Layout pass: place each shown node relative to its parent
+        layout = {}
+        for step in shown_steps:
+            val = insert_sequence[step]
+            parent_idx = rb_parents[step]
+            if parent_idx == NIL:
+                layout[val] = (ORIGIN + UP * 2.5, 0)
+            else:
+                parent_val = insert_sequence[parent_idx]
+                parent_pos, parent_depth = layout[parent_val]
+                depth = parent_depth + 1
+                pos = calculate_binary_tree_position(parent_pos, depth, val < parent_val,
+                                                     base_spacing=4.0, level_spacing=1.5)
+                layout[val] = (pos, depth)
+        
+        # Build all node mobjects before playing
+        built_nodes = [
+            self.create_rb_node(insert_sequence[step], layout[insert_sequence[step]][0],
+                                is_red=rb_parents[step] != NIL)
+            for step in shown_steps
+        ]
+        
         nodes = {}
         edges = []
-        root_val = None
-        
-        for val in insert_sequence[:4]:  # Show first few insertions
-            if root_val is None:
-                root_val = val
-                root_pos = ORIGIN + UP * 2.5
-                root_node = self.create_rb_node(val, root_pos, is_red=False)
-                nodes[val] = {'node': root_node, 'pos': root_pos}
-                self.play(Create(root_node), run_time=0.4)
-                self.wait(0.15)
+        for step, new_node in zip(shown_steps, built_nodes):
+            val = insert_sequence[step]
+            parent_idx = rb_parents[step]
+            pos, depth = layout[val]
+            nodes[val] = {'node': new_node, 'pos': pos, 'depth': depth, 'is_red': parent_idx != NIL}
+            if parent_idx == NIL:
+                self.play(Create(new_node), run_time=0.55)
             else:
-                # Simple insertion visualization
-                new_pos = ORIGIN + (LEFT if val < root_val else RIGHT) * 2 + UP * 1
-                new_node = self.create_rb_node(val, new_pos, is_red=True)
-                nodes[val] = {'node': new_node, 'pos': new_pos}
                 # Create edge connecting parent and new node at circle boundaries
-                parent_node = nodes[root_val]['node']
-                edge = create_edge_circular_nodes(parent_node, new_node)
+                parent_node = nodes[insert_sequence[parent_idx]]['node']
+                edge = create_edge_circular_nodes(parent_node, new_node, line=self.acquire_edge())
                 edges.append(edge)
-                self.play(Create(edge), Create(new_node), run_time=0.4)
-                self.wait(0.15)
+                self.play(Create(edge), Create(new_node), run_time=0.55)
+            
+            # Replay the fixup recolors for this step (last color per node wins)
+            step_colors = {}
+            for event_step, node_idx, action in rb_events:
+                if event_step == step and action in (ACTION_RECOLOR_RED, ACTION_RECOLOR_BLACK):
+                    step_colors[insert_sequence[node_idx]] = action == ACTION_RECOLOR_RED
+            recolors = []
+            for v, is_red in step_colors.items():
+                if nodes[v]['is_red'] != is_red:
+                    nodes[v]['is_red'] = is_red
+                    recolors.append(nodes[v]['node'][0].animate.set_color(RED if is_red else BLACK))
+            if recolors:
+                self.play(*recolors, run_time=0.4)
         
         self.wait(0.5)
         
-        # Show rotation maintaining balance
-        balance_title = Text("Rotations Maintain Balance", font_size=32).to_corner(UL)
-        self.play(Write(balance_title))
-        
-        # Visual demonstration
-        for val in list(nodes.keys())[:2]:
-            self.play(nodes[val]['node'].animate.set_color(YELLOW).scale(1.2), run_time=0.3)
-            self.wait(0.2)
-            self.play(nodes[val]['node'].animate.set_color(BLUE).scale(1/1.2), run_time=0.2)
-        
-        self.play(FadeOut(balance_title))
+        # Show rotation maintaining balance (decorative - skipped in fast mode)
+        if not self.fast_mode:
+            balance_title = Text("Rotations Maintain Balance", font_size=32).to_corner(UL)
+            self.play(Write(balance_title))
+            
+            # Visual demonstration
+            for val in islice(nodes, 2):
+                self.play(nodes[val]['node'].animate.set_color(YELLOW).scale(1.2), run_time=0.5)
+                self.play(nodes[val]['node'].animate.set_color(BLUE).scale(1/1.2), run_time=0.2)
+            
+            self.play(FadeOut(balance_title))
         
         # Show complexity
         complexity = self.create_complexity_display("Worst-case height: O(log n)")
         self.wait(1)
         
-        # Visual summary
-        self.play(*[nodes[v]['node'].animate.set_color(GOLD).scale(1.1) for v in nodes], run_time=0.5)
-        self.wait(1)
-        
-        # Visual summary complete
+        # Visual summary (decorative - skipped in fast mode)
+        if not self.fast_mode:
+            # Scale edges with the nodes so they stay attached; only nodes turn gold
+            node_group = VGroup(*[nodes[v]['node'] for v in nodes])
+            summary_group = VGroup(VGroup(*edges), node_group)
+            summary_group.generate_target()
+            summary_group.target[1].set_color(GOLD)
+            summary_group.target.scale(1.1)
+            self.play(MoveToTarget(summary_group), run_time=0.5)
+            self.wait(1)
     
     def create_rb_node(self, value, position, is_red=True):
-        """Create a red-black tree node"""
-        color = RED if is_red else BLACK
-        return create_circular_node(value, position, color=color, fill_opacity=1)
+        """Create a red-black tree node from a shared per-color circle prototype"""
+        proto = self._circle_protos.get(is_red)
+        if proto is None:
+            color = RED if is_red else BLACK
+            proto = Circle(radius=0.4, color=color, fill_opacity=1, fill_color=color, stroke_width=2)
+            self._circle_protos[is_red] = proto
+        text = make_text(str(value), font_size=24, color=WHITE, disable_ligatures=True)
+        return VGroup(proto.copy(), text).move_to(position)
 
@@ -3,35 +3,46 @@ Base class for tree visualizations
 Provides common initialization, setup, and utility methods
 """
 
-from manim import *
+from manim import config, Scene, VGroup, Line, Write, FadeOut, UL, DR, DOWN, LEFT, WHITE, YELLOW, BLUE
 import sys
 import os
-from Trees.utils import apply_manim_config, create_title
+from pathlib import Path
+from Trees.utils import apply_manim_config, create_title, make_text
+
+# Repository root, resolved once at import rather than on every scene init
+_PARENT_DIR = str(Path(__file__).resolve().parents[1])
 
 class BaseTreeVisualization(Scene):
     """Base class for tree visualizations with common setup and utilities"""
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
+        self._edge_pool = []
         self.setup_paths()
         self.setup_config()
     
-    def setup_paths(self):
-        """Set up import paths for utils"""
-        parent_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    def setup_paths(self, parent_dir=_PARENT_DIR):
+        """Set up import paths for utils (no-op once Trees.utils is importable)"""
+        if 'Trees.utils' in sys.modules:
+            return
         if parent_dir not in sys.path:
             sys.path.insert(0, parent_dir)
     
     def setup_config(self):
         """Apply Manim configuration"""
         fast_mode = os.getenv('FAST_MODE', 'False').lower() == 'true'
+        self.fast_mode = fast_mode  # Scenes may skip decorative segments when set
         apply_manim_config(fast=fast_mode)
+        if fast_mode:
+            # Keep partial-movie caching on so unchanged play() calls are reused between runs
+            config.disable_caching = False
+            config.flush_cache = False
     
     def create_title_section(self, title_text, font_size=48):
         """Create and display title section"""
         title = create_title(title_text, font_size=font_size)
-        self.play(Write(title), run_time=0.2)
-        self.wait(0.3)
+        # Static tail folded into run_time to avoid a separate wait segment
+        self.play(Write(title), run_time=0.5)
         return title
     
     def create_property_section(self, title_text, properties, position=UL, title_font_size=32):
@@ -47,7 +58,7 @@ class BaseTreeVisualization(Scene):
         Returns:
             VGroup containing all property elements
         """
-        property_title = Text(title_text, font_size=title_font_size).to_corner(position)
+        property_title = make_text(title_text, font_size=title_font_size).to_corner(position)
         self.play(Write(property_title))
         
         property_items = []
@@ -57,7 +68,7 @@ class BaseTreeVisualization(Scene):
             else:
                 text, color = prop, WHITE
             
-            prop_text = Text(text, font_size=24, color=color)
+            prop_text = make_text(text, font_size=24, color=color)
             property_items.append(prop_text)
         
         if property_items:
@@ -79,7 +90,7 @@ class BaseTreeVisualization(Scene):
         Returns:
             Text object
         """
-        complexity = Text(complexity_text, font_size=font_size).to_corner(position)
+        complexity = make_text(complexity_text, font_size=font_size).to_corner(position)
         self.play(Write(complexity), run_time=0.3)
         return complexity
     
@@ -110,6 +121,14 @@ class BaseTreeVisualization(Scene):
                 if i < len(path) - 1:
                     self.play(node.animate.set_color(default_color).scale(1/scale_factor), run_time=0.2)
     
+    def acquire_edge(self):
+        """Take a Line from the edge pool (or create one) for create_edge_circular_nodes(line=...)"""
+        return self._edge_pool.pop() if self._edge_pool else Line()
+    
+    def release_edge(self, *edges):
+        """Return edges that are no longer on screen to the pool for reuse"""
+        self._edge_pool.extend(edges)
+    
     def fade_out_group(self, *mobjects, run_time=0.3):
         """Fade out multiple mobjects"""
         self.play(*[FadeOut(mob) for mob in mobjects if mob is not None], run_time=run_time)
@@ -3,42 +3,59 @@ Tree building utilities for common binary tree operations
 Provides helpers for insertion, positioning, and tree construction
 """
 
-from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Tuple
-import copy
+from array import array
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Tuple, Union
 
 from manim import *
 import numpy as np
-from Trees.utils import create_circular_node, create_edge_circular_nodes, calculate_binary_tree_position
+from Trees.utils import create_circular_node, create_edge_circular_nodes, calculate_binary_tree_position, make_text
+from Trees.tree_kernels import (
+    ROT_NONE, ROT_LL, ROT_RR, ROT_LR, ROT_RL,
+    as_int64, avl_rebalance_path, bst_descent_path, bst_find, btree_descent_path, btree_insert,
+    BTREE_MAX_HEIGHT, btree_insert_many, tree_layout,
+)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class BTreeNodeData:
     id: int
-    keys: List[int] = field(default_factory=list)
-    children: List[int] = field(default_factory=list)  # child node IDs
+    keys: Tuple[int, ...] = ()
+    children: Tuple[int, ...] = ()  # child node IDs
 
 
-@dataclass
+@dataclass(slots=True)
 class BTreeState:
     """Immutable snapshot of a B-tree at a given step."""
     nodes: Dict[int, BTreeNodeData]
     root_id: int
 
 
-@dataclass
+@dataclass(slots=True)
 class BTreeDiff:
     """Diff between two B-tree states for localized animations."""
     new_nodes: set          # node IDs in new_state only
     removed_nodes: set      # node IDs in old_state only  
     modified_nodes: set     # node IDs in both but keys differ
     unchanged_nodes: set    # node IDs in both with identical keys
+    added_edges: set        # (parent_id, child_id) in new_state only
+    removed_edges: set      # (parent_id, child_id) in old_state only
+
+
+def _diff_child_edges(nid: int, old_children: Tuple[int, ...], new_children: Tuple[int, ...],
+                      added: set, removed: set) -> None:
+    """Record the (nid, child) edges that appear in or disappear from nid's child list."""
+    if old_children != new_children:
+        removed.update((nid, c) for c in old_children if c not in new_children)
+        added.update((nid, c) for c in new_children if c not in old_children)
 
 
 def diff_btree_states(old: BTreeState, new: BTreeState) -> BTreeDiff:
     """Compute structural diff between two B-tree states."""
-    old_ids = set(old.nodes.keys())
-    new_ids = set(new.nodes.keys())
+    # Set ops on the dict key views build each result set in one C call
+    old_ids = old.nodes.keys()
+    new_ids = new.nodes.keys()
 
     common = old_ids & new_ids
     new_nodes = new_ids - old_ids
@@ -46,17 +63,32 @@ def diff_btree_states(old: BTreeState, new: BTreeState) -> BTreeDiff:
 
     modified_nodes = set()
     unchanged_nodes = set()
+    added_edges = set()
+    removed_edges = set()
     for nid in common:
-        if old.nodes[nid].keys == new.nodes[nid].keys:
+        o = old.nodes[nid]
+        n = new.nodes[nid]
+        if o is n:
+            # Shared node record - builder snapshots reuse untouched nodes
+            unchanged_nodes.add(nid)
+            continue
+        if o.keys == n.keys:
             unchanged_nodes.add(nid)
         else:
             modified_nodes.add(nid)
+        _diff_child_edges(nid, o.children, n.children, added_edges, removed_edges)
+    for nid in new_nodes:
+        _diff_child_edges(nid, (), new.nodes[nid].children, added_edges, removed_edges)
+    for nid in removed_nodes:
+        _diff_child_edges(nid, old.nodes[nid].children, (), added_edges, removed_edges)
 
     return BTreeDiff(
         new_nodes=new_nodes,
         removed_nodes=removed_nodes,
         modified_nodes=modified_nodes,
         unchanged_nodes=unchanged_nodes,
+        added_edges=added_edges,
+        removed_edges=removed_edges,
     )
 
 
@@ -75,6 +107,8 @@ class BinaryTreeBuilder:
         self.base_spacing = base_spacing
         self.level_spacing = level_spacing
         self.root_y = root_y
+        # Child offset from its parent depends only on (level, side, spacings)
+        self._offsets: Dict[Tuple[int, bool, float, float], np.ndarray] = {}
     
     def calculate_position(self, parent_pos, level, is_left):
         """
@@ -88,8 +122,13 @@ class BinaryTreeBuilder:
         Returns:
             numpy array position
         """
-        return calculate_binary_tree_position(parent_pos, level, is_left, 
-                                            self.base_spacing, self.level_spacing)
+        key = (level, is_left, self.base_spacing, self.level_spacing)
+        offset = self._offsets.get(key)
+        if offset is None:
+            offset = calculate_binary_tree_position(ORIGIN, level, is_left,
+                                                    self.base_spacing, self.level_spacing)
+            self._offsets[key] = offset
+        return parent_pos + offset
     
     def insert_binary_node(self, current_val, new_val, tree, level, current_pos, 
                           node_creator=None, root_pos=None):
@@ -114,28 +153,23 @@ class BinaryTreeBuilder:
         if root_pos is None:
             root_pos = current_pos
         
-        if new_val < current_val:
-            if tree[current_val]['left'] is None:
-                new_pos = self.calculate_position(current_pos, level, is_left=True)
-                new_node = node_creator(new_val, new_pos)
-                return new_node, new_pos, current_val, True
+        # Walk down iteratively rather than recursing once per level
+        while True:
+            if new_val < current_val:
+                side, is_left = 'left', True
+            elif new_val > current_val:
+                side, is_left = 'right', False
             else:
-                left_val = tree[current_val]['left']
-                left_pos = tree[left_val]['pos']
-                return self.insert_binary_node(left_val, new_val, tree, level + 1, 
-                                             left_pos, node_creator, root_pos)
-        elif new_val > current_val:
-            if tree[current_val]['right'] is None:
-                new_pos = self.calculate_position(current_pos, level, is_left=False)
+                return None, None, None, None
+            
+            child_val = tree[current_val][side]
+            if child_val is None:
+                new_pos = self.calculate_position(current_pos, level, is_left=is_left)
                 new_node = node_creator(new_val, new_pos)
-                return new_node, new_pos, current_val, False
-            else:
-                right_val = tree[current_val]['right']
-                right_pos = tree[right_val]['pos']
-                return self.insert_binary_node(right_val, new_val, tree, level + 1, 
-                                             right_pos, node_creator, root_pos)
-        
-        return None, None, None, None
+                return new_node, new_pos, current_val, is_left
+            current_val = child_val
+            current_pos = tree[child_val]['pos']
+            level += 1
     
     def create_insertion_animation(self, scene, new_node, parent_node, edge=None, 
                                   run_time=0.4, wait_time=0.15):
@@ -170,17 +204,27 @@ class BinaryTreeBuilder:
             List of values in search path
         """
         path = [current_val]
-        if current_val == target:
-            return path
-        
-        if target < current_val and tree[current_val]['left']:
-            path.extend(self.search_path(tree[current_val]['left'], target, tree))
-        elif target > current_val and tree[current_val]['right']:
-            path.extend(self.search_path(tree[current_val]['right'], target, tree))
+        while current_val != target:
+            if target < current_val:
+                current_val = tree[current_val]['left']
+            else:
+                current_val = tree[current_val]['right']
+            if current_val is None:
+                break
+            path.append(current_val)
         
         return path
 
 
+def _even_split(total: int, parts: int) -> List[int]:
+    """Split total into parts sizes that differ by at most one, larger ones first."""
+    base, extra = divmod(total, parts)
+    return [base + 1] * extra + [base] * (parts - extra)
+
+
+_PATH_CACHE_SIZE = 128
+
+
 class BTreeBuilder:
     """Pure Python B-tree builder with no Manim dependencies."""
     
@@ -190,156 +234,246 @@ class BTreeBuilder:
         self.reset()
     
     def reset(self):
-        self._next_id = 0
-        self._nodes: Dict[int, BTreeNodeData] = {}
+        # Structure-of-arrays storage: node i owns the fixed-stride rows
+        # _keys[i * _key_stride:] and _children[i * _child_stride:], each with
+        # room for the extra key/child a node holds just before it splits
+        self._key_stride = self.max_keys + 1
+        self._child_stride = self.max_keys + 2
+        self._keys = array('q')
+        self._nkeys = array('q')
+        self._children = array('q')
+        self._nchildren = array('q')  # 0 for leaves
+        self._n_nodes = 0  # rows in use - the arrays may hold spare rows past these
+        self._height = 0
         self._root_id: Optional[int] = None
+        # Snapshot node dict shared between states; only dirty ids are rebuilt
+        self._state_nodes: Dict[int, BTreeNodeData] = {}
+        self._dirty: set = set()
+        # Diff from the previous snapshot to the latest one, built from the dirty ids
+        self.last_diff: Optional[BTreeDiff] = None
+        # (target, stop_on_match) -> descent path; cleared whenever a snapshot is taken
+        self._path_cache: Dict[Tuple[int, bool], List[int]] = {}
     
     def insert_and_snapshot(self, key: int) -> Tuple[BTreeState, int]:
         """
         Insert a key and return (snapshot, leaf_node_id where key was inserted).
         """
         if self._root_id is None:
-            root = self._new_node([key], [])
-            self._root_id = root.id
-            return self._snapshot(), root.id
-        else:
-            root_node = self._nodes[self._root_id]
-            if len(root_node.keys) > self.max_keys:
-                self._split_root()
-            leaf_id = self._insert_non_full(self._root_id, key)
-            # Check if root needs split after insert
-            root_node = self._nodes[self._root_id]
-            if len(root_node.keys) > self.max_keys:
-                self._split_root()
-            return self._snapshot(), leaf_id
+            self._root_id = self._new_node([key], [])
+            self._height = 1
+            return self._snapshot(), self._root_id
+        
+        # A split on every level adds one node per level plus a new root
+        self._reserve(self._height + 1)
+        root, leaf_id, n_nodes, touched = btree_insert(
+            self._root_id,
+            key,
+            self.max_keys,
+            self._n_nodes,
+            as_int64(self._keys),
+            as_int64(self._nkeys),
+            as_int64(self._children),
+            as_int64(self._nchildren),
+        )
+        if root != self._root_id:
+            self._root_id = int(root)
+            self._height += 1
+        self._n_nodes = int(n_nodes)
+        self._dirty.update(touched.tolist())
+        return self._snapshot(), int(leaf_id)
+    
+    def insert_many(self, keys: List[int]) -> BTreeState:
+        """
+        Insert keys in order and return a single snapshot of the result.
+        
+        Same tree as calling insert_and_snapshot per key, but the run goes through
+        the kernel in a few calls and last_diff covers every insert at once.
+        Raises ValueError if the tree would grow past BTREE_MAX_HEIGHT levels.
+        """
+        keys = list(keys)
+        if not keys:
+            return self._snapshot()
+        if self._root_id is None:
+            self._root_id = self._new_node([keys.pop(0)], [])
+            self._height = 1
+        
+        key_array = array('q', keys)
+        dirty = array('q')
+        done = 0
+        while done < len(key_array) and self._height < BTREE_MAX_HEIGHT:
+            # Room for the rest of the run if each key adds about one node; nodes
+            # can hold no keys (order 2), so the kernel stops early if it runs out
+            self._reserve(max(self._height + 1, len(key_array) - done))
+            dirty.extend(array('q', bytes(8 * (len(self._nkeys) - len(dirty)))))
+            root, height, n_nodes, done = btree_insert_many(
+                self._root_id,
+                self._height,
+                as_int64(key_array),
+                done,
+                self.max_keys,
+                self._n_nodes,
+                as_int64(self._keys),
+                as_int64(self._nkeys),
+                as_int64(self._children),
+                as_int64(self._nchildren),
+                as_int64(dirty),
+            )
+            self._root_id = int(root)
+            self._height = int(height)
+            self._n_nodes = int(n_nodes)
+            done = int(done)
+        self._dirty.update(np.flatnonzero(dirty).tolist())
+        if done < len(key_array):
+            raise ValueError(
+                f"B-tree reached {BTREE_MAX_HEIGHT} levels; "
+                f"{len(key_array) - done} keys not inserted"
+            )
+        return self._snapshot()
+    
+    def bulk_load(self, keys: List[int]) -> BTreeState:
+        """
+        Replace the tree with one built bottom-up from keys and return its snapshot.
+        
+        Keys are sorted and deduplicated, packed into as few leaves as possible
+        with separators promoted level by level - O(N) instead of N inserts.
+        """
+        self.reset()
+        keys = sorted(set(keys))
+        if not keys:
+            return self._snapshot()
+        
+        # Leaves: n_leaves - 1 keys become separators, the rest are spread evenly
+        n_leaves = -(-(len(keys) + 1) // (self.max_keys + 1))
+        level = []          # node ids on the level being built
+        separators = []     # key between level[i] and level[i + 1]
+        pos = 0
+        for i, count in enumerate(_even_split(len(keys) - (n_leaves - 1), n_leaves)):
+            level.append(self._new_node(keys[pos:pos + count], []))
+            pos += count
+            if i < n_leaves - 1:
+                separators.append(keys[pos])
+                pos += 1
+        self._height = 1
+        
+        # Internal levels: group children under parents until one root remains
+        while len(level) > 1:
+            n_parents = -(-len(level) // (self.max_keys + 1))
+            next_level = []
+            next_separators = []
+            start = 0
+            for i, count in enumerate(_even_split(len(level), n_parents)):
+                end = start + count
+                next_level.append(self._new_node(separators[start:end - 1], level[start:end]))
+                if i < n_parents - 1:
+                    next_separators.append(separators[end - 1])
+                start = end
+            level = next_level
+            separators = next_separators
+            self._height += 1
+        
+        self._root_id = level[0]
+        return self._snapshot()
     
     def search_path(self, target: int) -> List[int]:
-        if self._root_id is None:
-            return []
-        path = []
-        node_id = self._root_id
-        while node_id is not None:
-            path.append(node_id)
-            node = self._nodes[node_id]
-            if target in node.keys:
-                break
-            if not node.children:
-                break
-            idx = 0
-            while idx < len(node.keys) and target > node.keys[idx]:
-                idx += 1
-            node_id = node.children[idx] if idx < len(node.children) else None
-        return path
+        return self._descent_path(target, True)
     
     def get_insertion_path(self, key: int) -> List[int]:
         """Get the path from root to where a key would be inserted (without inserting)."""
+        return self._descent_path(key, False)
+    
+    def _descent_path(self, target: int, stop_on_match: bool) -> List[int]:
         if self._root_id is None:
             return []
-        path = []
-        node_id = self._root_id
-        while node_id is not None:
-            path.append(node_id)
-            node = self._nodes[node_id]
-            if not node.children:
-                break  # Reached leaf
-            idx = 0
-            while idx < len(node.keys) and key > node.keys[idx]:
-                idx += 1
-            node_id = node.children[idx] if idx < len(node.children) else None
-        return path
+        # Scenes query the same path to explain, highlight and animate a step
+        cache_key = (target, stop_on_match)
+        path = self._path_cache.get(cache_key)
+        if path is None:
+            if len(self._path_cache) >= _PATH_CACHE_SIZE:
+                del self._path_cache[next(iter(self._path_cache))]
+            path = self._path_cache[cache_key] = self._compute_descent_path(target, stop_on_match)
+        return path.copy()
+    
+    def _compute_descent_path(self, target: int, stop_on_match: bool) -> List[int]:
+        return btree_descent_path(
+            self._root_id,
+            self.max_keys,
+            as_int64(self._keys),
+            as_int64(self._nkeys),
+            as_int64(self._children),
+            as_int64(self._nchildren),
+            target,
+            stop_on_match,
+        ).tolist()
     
     def _snapshot(self) -> BTreeState:
-        nodes_copy = {}
-        for nid, node in self._nodes.items():
-            nodes_copy[nid] = BTreeNodeData(
-                id=node.id,
-                keys=list(node.keys),
-                children=list(node.children)
+        # Untouched nodes keep their (immutable) node data from the previous snapshot
+        state_nodes = self._state_nodes
+        keys_of, nkeys = self._keys, self._nkeys
+        children_of, nchildren = self._children, self._nchildren
+        key_stride = self._key_stride
+        child_stride = self._child_stride
+        new_nodes = set()
+        modified_nodes = set()
+        added_edges = set()
+        removed_edges = set()
+        for nid in self._dirty:
+            old = state_nodes.get(nid)
+            k = nid * key_stride
+            c = nid * child_stride
+            node = BTreeNodeData(
+                id=nid,
+                keys=tuple(keys_of[k:k + nkeys[nid]]),
+                children=tuple(children_of[c:c + nchildren[nid]])
             )
-        return BTreeState(nodes=nodes_copy, root_id=self._root_id)
-    
-    def _new_node(self, keys: List[int], children: List[int]) -> BTreeNodeData:
-        node = BTreeNodeData(id=self._next_id, keys=list(keys), children=list(children))
-        self._nodes[self._next_id] = node
-        self._next_id += 1
-        return node
-    
-    def _insert_non_full(self, node_id: int, key: int) -> int:
-        """Insert key into subtree rooted at node_id. Returns leaf node id where key was inserted."""
-        node = self._nodes[node_id]
-        if not node.children:
-            # Leaf node - insert here
-            idx = 0
-            while idx < len(node.keys) and key > node.keys[idx]:
-                idx += 1
-            node.keys.insert(idx, key)
-            return node_id
-        else:
-            # Internal node - find child to recurse into
-            idx = 0
-            while idx < len(node.keys) and key > node.keys[idx]:
-                idx += 1
-            child_id = node.children[idx]
-            leaf_id = self._insert_non_full(child_id, key)
-            
-            # After recursive insert, check if child overflowed and needs split
-            child = self._nodes[child_id]
-            if len(child.keys) > self.max_keys:
-                self._split_child(node_id, idx)
-            
-            return leaf_id
-    
-    def _split_child(self, parent_id: int, child_index: int):
-        parent = self._nodes[parent_id]
-        child_id = parent.children[child_index]
-        child = self._nodes[child_id]
-        
-        mid = len(child.keys) // 2
-        mid_key = child.keys[mid]
-        
-        left_keys = child.keys[:mid]
-        right_keys = child.keys[mid + 1:]
-        
-        if child.children:
-            left_children = child.children[:mid + 1]
-            right_children = child.children[mid + 1:]
-        else:
-            left_children = []
-            right_children = []
-        
-        child.keys = left_keys
-        child.children = left_children
-        
-        new_node = self._new_node(right_keys, right_children)
-        
-        parent.keys.insert(child_index, mid_key)
-        parent.children.insert(child_index + 1, new_node.id)
-    
-    def _split_root(self):
-        old_root = self._nodes[self._root_id]
-        
-        mid = len(old_root.keys) // 2
-        mid_key = old_root.keys[mid]
-        
-        left_keys = old_root.keys[:mid]
-        right_keys = old_root.keys[mid + 1:]
-        
-        if old_root.children:
-            left_children = old_root.children[:mid + 1]
-            right_children = old_root.children[mid + 1:]
-        else:
-            left_children = []
-            right_children = []
-        
-        old_root.keys = left_keys
-        old_root.children = left_children
+            state_nodes[nid] = node
+            if old is None:
+                new_nodes.add(nid)
+                _diff_child_edges(nid, (), node.children, added_edges, removed_edges)
+            else:
+                if old.keys != node.keys:
+                    modified_nodes.add(nid)
+                _diff_child_edges(nid, old.children, node.children, added_edges, removed_edges)
+        self._dirty.clear()
+        self._path_cache.clear()
         
-        right_node = self._new_node(right_keys, right_children)
-        new_root = self._new_node([mid_key], [self._root_id, right_node.id])
-        self._root_id = new_root.id
-
-
-@dataclass
+        self.last_diff = BTreeDiff(
+            new_nodes=new_nodes,
+            removed_nodes=set(),
+            modified_nodes=modified_nodes,
+            unchanged_nodes=state_nodes.keys() - new_nodes - modified_nodes,
+            added_edges=added_edges,
+            removed_edges=removed_edges,
+        )
+        return BTreeState(nodes=state_nodes.copy(), root_id=self._root_id)
+    
+    def _reserve(self, rows: int) -> None:
+        """Make sure the arrays hold at least rows spare rows past the last node."""
+        capacity = len(self._nkeys)
+        needed = self._n_nodes + rows
+        if needed > capacity:
+            # Grow geometrically so row appends stay amortized O(1)
+            grow = max(needed - capacity, capacity)
+            self._keys.extend(array('q', bytes(8 * grow * self._key_stride)))
+            self._nkeys.extend(array('q', bytes(8 * grow)))
+            self._children.extend(array('q', bytes(8 * grow * self._child_stride)))
+            self._nchildren.extend(array('q', bytes(8 * grow)))
+    
+    def _new_node(self, keys: List[int], children: List[int]) -> int:
+        """Write a node into the next free row and return its id."""
+        self._reserve(1)
+        node_id = self._n_nodes
+        self._n_nodes += 1
+        k = node_id * self._key_stride
+        c = node_id * self._child_stride
+        self._keys[k:k + len(keys)] = array('q', keys)
+        self._nkeys[node_id] = len(keys)
+        self._children[c:c + len(children)] = array('q', children)
+        self._nchildren[node_id] = len(children)
+        self._dirty.add(node_id)
+        return node_id
+
+
+@dataclass(frozen=True, slots=True)
 class BSTNodeData:
     id: int
     key: int
@@ -347,26 +481,43 @@ class BSTNodeData:
     right: Optional[int] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class BSTState:
     """Immutable snapshot of a BST at a given step."""
     nodes: Dict[int, BSTNodeData]
     root_id: Optional[int]
 
+    def signature(self) -> Tuple:
+        """Hashable structure of the tree: root plus (id, key, left, right) per node, by id."""
+        return (
+            self.root_id,
+            tuple(sorted((n.id, n.key, n.left, n.right) for n in self.nodes.values())),
+        )
 
-@dataclass
+
+@dataclass(slots=True)
 class BSTDiff:
     """Diff between two BST states for localized animations."""
     new_nodes: set          # node IDs in new_state only
     removed_nodes: set      # node IDs in old_state only
     modified_nodes: set     # key changed (two-children delete)
     unchanged_nodes: set    # node IDs in both with identical keys
+    added_edges: set        # (parent_id, child_id) in new_state only
+    removed_edges: set      # (parent_id, child_id) in old_state only
+
+
+def _binary_children(node) -> Tuple[int, ...]:
+    """Present children of a BST/AVL node, left first."""
+    if node.left is None:
+        return () if node.right is None else (node.right,)
+    return (node.left,) if node.right is None else (node.left, node.right)
 
 
 def diff_bst_states(old: BSTState, new: BSTState) -> BSTDiff:
     """Compute structural diff between two BST states."""
-    old_ids = set(old.nodes.keys()) if old.nodes else set()
-    new_ids = set(new.nodes.keys()) if new.nodes else set()
+    # Set ops on the dict key views build each result set in one C call
+    old_ids = old.nodes.keys()
+    new_ids = new.nodes.keys()
 
     common = old_ids & new_ids
     new_nodes = new_ids - old_ids
@@ -374,20 +525,38 @@ def diff_bst_states(old: BSTState, new: BSTState) -> BSTDiff:
 
     modified_nodes = set()
     unchanged_nodes = set()
+    added_edges = set()
+    removed_edges = set()
     for nid in common:
-        if old.nodes[nid].key == new.nodes[nid].key:
+        o = old.nodes[nid]
+        n = new.nodes[nid]
+        if o is n:
+            # Shared node record - builder snapshots reuse untouched nodes
+            unchanged_nodes.add(nid)
+            continue
+        if o.key == n.key:
             unchanged_nodes.add(nid)
         else:
             modified_nodes.add(nid)
+        _diff_child_edges(nid, _binary_children(o), _binary_children(n), added_edges, removed_edges)
+    for nid in new_nodes:
+        _diff_child_edges(nid, (), _binary_children(new.nodes[nid]), added_edges, removed_edges)
+    for nid in removed_nodes:
+        _diff_child_edges(nid, _binary_children(old.nodes[nid]), (), added_edges, removed_edges)
 
     return BSTDiff(
         new_nodes=new_nodes,
         removed_nodes=removed_nodes,
         modified_nodes=modified_nodes,
         unchanged_nodes=unchanged_nodes,
+        added_edges=added_edges,
+        removed_edges=removed_edges,
     )
 
 
+_NIL = -1  # "no child" marker in the BST child arrays
+
+
 class BSTBuilder:
     """Pure Python BST builder with no Manim dependencies."""
     
@@ -395,93 +564,162 @@ class BSTBuilder:
         self.reset()
     
     def reset(self):
-        self._next_id = 0
-        self._nodes: Dict[int, BSTNodeData] = {}
+        # Structure-of-arrays storage indexed by node id; _NIL marks a missing child
+        self._keys = array('q')
+        self._left = array('q')
+        self._right = array('q')
+        self._alive = bytearray()   # 0 once a node has been deleted
         self._root_id: Optional[int] = None
-    
-    def _new_node(self, key: int) -> BSTNodeData:
-        node = BSTNodeData(id=self._next_id, key=key)
-        self._nodes[self._next_id] = node
-        self._next_id += 1
-        return node
+        # Snapshot node dict shared between states; only dirty ids are rebuilt
+        self._state_nodes: Dict[int, BSTNodeData] = {}
+        self._dirty: set = set()
+        # Diff from the previous snapshot to the latest one, built from the dirty ids
+        self.last_diff: Optional[BSTDiff] = None
+        self._last_snapshot = BSTState(nodes={}, root_id=None)
+    
+    def _new_node(self, key: int) -> int:
+        """Append a node to the arrays and return its id."""
+        self._keys.append(key)
+        self._left.append(_NIL)
+        self._right.append(_NIL)
+        self._alive.append(1)
+        node_id = len(self._keys) - 1
+        self._dirty.add(node_id)
+        return node_id
     
     def _snapshot(self) -> BSTState:
-        nodes_copy = {}
-        for nid, node in self._nodes.items():
-            nodes_copy[nid] = BSTNodeData(
-                id=node.id,
-                key=node.key,
-                left=node.left,
-                right=node.right
+        # Untouched nodes keep their (immutable) node data from the previous snapshot
+        keys, left, right = self._keys, self._left, self._right
+        state_nodes = self._state_nodes
+        new_nodes = set()
+        removed_nodes = set()
+        modified_nodes = set()
+        added_edges = set()
+        removed_edges = set()
+        for nid in self._dirty:
+            old = state_nodes.get(nid)
+            old_children = () if old is None else _binary_children(old)
+            if not self._alive[nid]:
+                if old is not None:
+                    del state_nodes[nid]
+                    removed_nodes.add(nid)
+                    _diff_child_edges(nid, old_children, (), added_edges, removed_edges)
+                continue
+            l = left[nid]
+            r = right[nid]
+            node = BSTNodeData(
+                id=nid,
+                key=keys[nid],
+                left=None if l == _NIL else l,
+                right=None if r == _NIL else r
             )
-        return BSTState(nodes=nodes_copy, root_id=self._root_id)
+            state_nodes[nid] = node
+            if old is None:
+                new_nodes.add(nid)
+            elif old.key != node.key:
+                modified_nodes.add(nid)
+            _diff_child_edges(nid, old_children, _binary_children(node), added_edges, removed_edges)
+        self._dirty.clear()
+        
+        self.last_diff = BSTDiff(
+            new_nodes=new_nodes,
+            removed_nodes=removed_nodes,
+            modified_nodes=modified_nodes,
+            unchanged_nodes=state_nodes.keys() - new_nodes - modified_nodes,
+            added_edges=added_edges,
+            removed_edges=removed_edges,
+        )
+        self._last_snapshot = BSTState(nodes=state_nodes.copy(), root_id=self._root_id)
+        return self._last_snapshot
+    
+    def _unchanged_snapshot(self) -> BSTState:
+        """Return the previous snapshot again for an operation that changed nothing."""
+        self.last_diff = BSTDiff(
+            new_nodes=set(),
+            removed_nodes=set(),
+            modified_nodes=set(),
+            unchanged_nodes=set(self._state_nodes),
+            added_edges=set(),
+            removed_edges=set(),
+        )
+        return self._last_snapshot
+    
+    def bulk_load(self, keys: List[int]) -> BSTState:
+        """
+        Replace the tree with a balanced one built from keys and return its snapshot.
+        
+        Keys are sorted and deduplicated; each subtree's root is the midpoint of
+        its key range, so the tree is built in one O(N) pass instead of N inserts.
+        Node ids follow pre-order, as if the keys had been inserted root first.
+        """
+        self.reset()
+        keys = sorted(set(keys))
+        if not keys:
+            return self._snapshot()
+        
+        left, right = self._left, self._right
+        # (lo, hi, parent_id, is_left) ranges still to be placed
+        pending = [(0, len(keys), _NIL, False)]
+        while pending:
+            lo, hi, parent_id, is_left = pending.pop()
+            mid = (lo + hi) // 2
+            node_id = self._new_node(keys[mid])
+            if parent_id == _NIL:
+                self._root_id = node_id
+            elif is_left:
+                left[parent_id] = node_id
+            else:
+                right[parent_id] = node_id
+            # Push right first so the left subtree is numbered first
+            if mid + 1 < hi:
+                pending.append((mid + 1, hi, node_id, False))
+            if lo < mid:
+                pending.append((lo, mid, node_id, True))
+        
+        return self._snapshot()
     
     def insert_and_snapshot(self, key: int) -> Tuple[BSTState, int]:
         """
         Insert a key and return (snapshot, node_id of inserted node).
         """
         if self._root_id is None:
-            root = self._new_node(key)
-            self._root_id = root.id
-            return self._snapshot(), root.id
+            self._root_id = self._new_node(key)
+            return self._snapshot(), self._root_id
         
         # Find insertion point
+        keys, left, right = self._keys, self._left, self._right
         current_id = self._root_id
         while True:
-            current = self._nodes[current_id]
-            if key < current.key:
-                if current.left is None:
-                    new_node = self._new_node(key)
-                    current.left = new_node.id
-                    return self._snapshot(), new_node.id
-                current_id = current.left
-            elif key > current.key:
-                if current.right is None:
-                    new_node = self._new_node(key)
-                    current.right = new_node.id
-                    return self._snapshot(), new_node.id
-                current_id = current.right
+            current_key = keys[current_id]
+            if key < current_key:
+                if left[current_id] == _NIL:
+                    new_id = self._new_node(key)
+                    left[current_id] = new_id
+                    self._dirty.add(current_id)
+                    return self._snapshot(), new_id
+                current_id = left[current_id]
+            elif key > current_key:
+                if right[current_id] == _NIL:
+                    new_id = self._new_node(key)
+                    right[current_id] = new_id
+                    self._dirty.add(current_id)
+                    return self._snapshot(), new_id
+                current_id = right[current_id]
             else:
                 # Duplicate key - return current state and existing node
-                return self._snapshot(), current_id
+                return self._unchanged_snapshot(), current_id
     
     def get_insertion_path(self, key: int) -> List[int]:
         """Get the path from root to where a key would be inserted (without inserting)."""
-        if self._root_id is None:
-            return []
-        path = []
-        current_id = self._root_id
-        while current_id is not None:
-            path.append(current_id)
-            current = self._nodes[current_id]
-            if key < current.key:
-                if current.left is None:
-                    break
-                current_id = current.left
-            elif key > current.key:
-                if current.right is None:
-                    break
-                current_id = current.right
-            else:
-                break  # Key already exists
-        return path
+        return self.search_path(key)
     
     def search_path(self, key: int) -> List[int]:
         """Get the path from root to a key (or where it would be)."""
         if self._root_id is None:
             return []
-        path = []
-        current_id = self._root_id
-        while current_id is not None:
-            path.append(current_id)
-            current = self._nodes[current_id]
-            if key == current.key:
-                break
-            elif key < current.key:
-                current_id = current.left
-            else:
-                current_id = current.right
-        return path
+        return bst_descent_path(
+            self._root_id, as_int64(self._keys), as_int64(self._left), as_int64(self._right), key
+        ).tolist()
     
     def classify_deletion_case(self, key: int) -> Tuple[Optional[int], str]:
         """
@@ -493,94 +731,85 @@ class BSTBuilder:
         if self._root_id is None:
             return None, "not_found"
         
-        # Find the node
-        current_id = self._root_id
-        while current_id is not None:
-            current = self._nodes[current_id]
-            if key == current.key:
-                # Found the node - classify
-                has_left = current.left is not None
-                has_right = current.right is not None
-                if not has_left and not has_right:
-                    return current_id, "leaf"
-                elif has_left and has_right:
-                    return current_id, "two_children"
-                else:
-                    return current_id, "one_child"
-            elif key < current.key:
-                current_id = current.left
-            else:
-                current_id = current.right
+        node_id = bst_find(
+            self._root_id, as_int64(self._keys), as_int64(self._left), as_int64(self._right), key
+        )
+        if node_id == _NIL:
+            return None, "not_found"
         
-        return None, "not_found"
-    
-    def _find_min_with_parent(self, node_id: int, parent_id: Optional[int]) -> Tuple[int, Optional[int]]:
-        """Find minimum node in subtree and its parent."""
-        current_id = node_id
-        current_parent = parent_id
-        while True:
-            current = self._nodes[current_id]
-            if current.left is None:
-                return current_id, current_parent
-            current_parent = current_id
-            current_id = current.left
+        has_left = self._left[node_id] != _NIL
+        has_right = self._right[node_id] != _NIL
+        if not has_left and not has_right:
+            return node_id, "leaf"
+        elif has_left and has_right:
+            return node_id, "two_children"
+        else:
+            return node_id, "one_child"
     
-    def _delete_recursive(self, node_id: Optional[int], key: int) -> Tuple[Optional[int], str]:
+    def _delete(self, key: int) -> str:
         """
-        Delete key from subtree rooted at node_id.
+        Delete key from the tree, relinking the parent in place.
         
         Returns:
-            (new_subtree_root_id, case_str)
+            case_str in {"leaf", "one_child", "two_children", "not_found"}
         """
-        if node_id is None:
-            return None, "not_found"
-        
-        node = self._nodes[node_id]
+        keys, left, right = self._keys, self._left, self._right
+        if self._root_id is None:
+            return "not_found"
         
-        if key < node.key:
-            new_left, case = self._delete_recursive(node.left, key)
-            node.left = new_left
-            return node_id, case
-        elif key > node.key:
-            new_right, case = self._delete_recursive(node.right, key)
-            node.right = new_right
-            return node_id, case
+        # Walk down to the node, tracking its parent and which side we came from
+        parent_id = _NIL
+        is_left_child = False
+        node_id = self._root_id
+        while node_id != _NIL:
+            node_key = keys[node_id]
+            if key == node_key:
+                break
+            parent_id = node_id
+            is_left_child = key < node_key
+            node_id = left[node_id] if is_left_child else right[node_id]
         else:
-            # Found the node to delete
-            has_left = node.left is not None
-            has_right = node.right is not None
+            return "not_found"
+        
+        node_left = left[node_id]
+        node_right = right[node_id]
+        if node_left != _NIL and node_right != _NIL:
+            # Two children - inorder successor is the leftmost node of the right subtree
+            successor_parent = node_id
+            successor_id = node_right
+            while left[successor_id] != _NIL:
+                successor_parent = successor_id
+                successor_id = left[successor_id]
+            
+            # Copy successor's key to current node
+            keys[node_id] = keys[successor_id]
             
-            if not has_left and not has_right:
-                # Leaf node
-                del self._nodes[node_id]
-                return None, "leaf"
-            elif not has_left:
-                # Only right child
-                del self._nodes[node_id]
-                return node.right, "one_child"
-            elif not has_right:
-                # Only left child
-                del self._nodes[node_id]
-                return node.left, "one_child"
+            # Delete successor (it has at most one child - right child)
+            if successor_parent == node_id:
+                # Successor is immediate right child
+                right[node_id] = right[successor_id]
             else:
-                # Two children - find inorder successor
-                successor_id, successor_parent = self._find_min_with_parent(node.right, node_id)
-                successor = self._nodes[successor_id]
-                
-                # Copy successor's key to current node
-                node.key = successor.key
-                
-                # Delete successor (it has at most one child - right child)
-                if successor_parent == node_id:
-                    # Successor is immediate right child
-                    node.right = successor.right
-                else:
-                    # Successor is deeper in the tree
-                    parent = self._nodes[successor_parent]
-                    parent.left = successor.right
-                
-                del self._nodes[successor_id]
-                return node_id, "two_children"
+                # Successor is deeper in the tree
+                left[successor_parent] = right[successor_id]
+            
+            self._alive[successor_id] = 0
+            self._dirty.update((node_id, successor_parent, successor_id))
+            return "two_children"
+        
+        # Leaf or one child - splice the (possibly absent) child into the parent
+        replacement = node_left if node_left != _NIL else node_right
+        if parent_id == _NIL:
+            self._root_id = None if replacement == _NIL else replacement
+        elif is_left_child:
+            left[parent_id] = replacement
+            self._dirty.add(parent_id)
+        else:
+            right[parent_id] = replacement
+            self._dirty.add(parent_id)
+        
+        self._alive[node_id] = 0
+        self._dirty.add(node_id)
+        return "leaf" if replacement == _NIL else "one_child"
     
     def delete_and_snapshot(self, key: int) -> Tuple[BSTState, str]:
         """
@@ -588,26 +817,174 @@ class BSTBuilder:
         
         case_str in {"leaf", "one_child", "two_children", "not_found"}
         """
-        new_root, case = self._delete_recursive(self._root_id, key)
-        self._root_id = new_root
+        case = self._delete(key)
+        if case == "not_found":
+            return self._unchanged_snapshot(), case
         return self._snapshot(), case
 
 
+def _compute_tree_layout(
+    children_of: Dict[int, List[int]],
+    root: int,
+    vertex_spacing: Optional[Tuple[float, float]] = None,
+    layout_scale: float = 2.0,
+) -> Dict[int, np.ndarray]:
+    """
+    Tree layout without building a Manim Graph.
+    
+    Same placement rules as Graph(layout="tree"): leaves take the next free
+    slot on their level, parents sit over the mean of their children (sliding
+    right with their subtree if that slot is taken), and the result is
+    centered. Children are visited left to right so subtrees keep key order.
+    
+    Args:
+        children_of: Dict mapping node_id -> ordered list of child IDs
+        root: Root node ID
+        vertex_spacing: (horizontal, vertical) spacing between nodes; when None
+                        the layout is scaled to fit layout_scale instead
+        layout_scale: Overall scale of the layout (used without vertex_spacing)
+    
+    Returns:
+        Dict mapping node_id -> position (rows of one (N, 3) array)
+    """
+    # Ragged child arrays over dense indices for the layout kernel
+    ids = list(children_of)
+    index = {nid: i for i, nid in enumerate(ids)}
+    child_offsets = array('q', [0])
+    flat_children = array('q')
+    for nid in ids:
+        flat_children.extend([index[c] for c in children_of[nid]])
+        child_offsets.append(len(flat_children))
+    
+    pos_x = np.zeros(len(ids))
+    depth = np.zeros(len(ids), dtype=np.int64)
+    tree_layout(index[root], as_int64(child_offsets), as_int64(flat_children), pos_x, depth)
+    
+    coords = np.zeros((len(ids), 3))
+    coords[:, 0] = pos_x
+    coords[:, 1] = -depth
+    
+    # Center, then scale
+    mins = coords.min(axis=0)
+    maxs = coords.max(axis=0)
+    coords -= (mins + maxs) / 2
+    if vertex_spacing is not None:
+        coords[:, 0] *= vertex_spacing[0]
+        coords[:, 1] *= vertex_spacing[1]
+    else:
+        extent = max(maxs[0] - mins[0], maxs[1] - mins[1])
+        if extent > 0:
+            coords *= 2 * layout_scale / extent
+    
+    return dict(zip(ids, coords))
+
+
+# Node positions by tree shape and layout parameters, so a shape that is laid
+# out again (rebuilds, repeated transitions) skips the layout pass. Oldest
+# entries are evicted first.
+_LAYOUT_CACHE_SIZE = 64
+_layout_cache: Dict[tuple, Tuple[List[int], np.ndarray]] = {}
+
+
+def _cached_layout(key: tuple, compute: Callable[[], Dict[int, np.ndarray]]) -> Dict[int, np.ndarray]:
+    """
+    Positions for key, calling compute() only on a cache miss.
+    
+    Each call returns fresh arrays, so callers may modify them in place.
+    """
+    entry = _layout_cache.get(key)
+    if entry is None:
+        positions = compute()
+        entry = (list(positions), np.array(list(positions.values()), dtype=float))
+        if len(_layout_cache) >= _LAYOUT_CACHE_SIZE:
+            del _layout_cache[next(iter(_layout_cache))]
+        _layout_cache[key] = entry
+    ids, coords = entry
+    return dict(zip(ids, coords.copy()))
+
+
+def _reset_shape_colors(shapes, fill_color, fill_opacity: float,
+                        stroke_color, stroke_width: Optional[float] = None) -> None:
+    """
+    Restyle many node shapes (circles/rectangles) with one color conversion.
+    
+    Same result as set_fill(fill_color, opacity=fill_opacity) plus
+    set_stroke(stroke_color, width=stroke_width) on each shape, but writes the
+    shapes' rgba arrays in place instead of re-parsing colors per node.
+    """
+    fill_rgba = ManimColor(fill_color).to_rgba_with_alpha(fill_opacity)
+    stroke_rgb = ManimColor(stroke_color).to_rgb()
+    for shape in shapes:
+        if shape.submobjects or getattr(shape, "fill_rgbas", None) is None:
+            # Not a plain Cairo shape - use the regular setters
+            shape.set_fill(fill_color, opacity=fill_opacity)
+            shape.set_stroke(stroke_color, width=stroke_width)
+            continue
+        shape.fill_rgbas[:] = fill_rgba
+        shape.fill_opacity = fill_opacity
+        shape.stroke_rgbas[:, :3] = stroke_rgb
+        if stroke_width is not None:
+            shape.stroke_width = stroke_width
+
+
+def _snap_edge_to_circular_nodes(edge: Line, parent_node: VGroup, child_node: VGroup) -> None:
+    """Set the edge endpoints once so it connects the given parent/child circular nodes."""
+    try:
+        start = parent_node[0].get_bottom()  # [0] is the circle
+        end = child_node[0].get_top()
+        # Avoid zero-length edges which cause numpy cross product errors
+        # (squared length vs 0.01 ** 2, without a per-frame norm call)
+        dx = end[0] - start[0]
+        dy = end[1] - start[1]
+        dz = end[2] - start[2]
+        if dx * dx + dy * dy + dz * dz > 1e-4:
+            edge.put_start_and_end_on(start, end)
+    except (ValueError, IndexError, AttributeError):
+        pass  # Skip update if geometry is invalid
+
+
 def _connect_edge_to_circular_nodes(edge: Line, parent_node: VGroup, child_node: VGroup) -> None:
     """Attach an updater so the edge always connects the given parent/child circular nodes."""
     def update_edge(e: Line) -> None:
-        try:
-            start = parent_node[0].get_bottom()  # [0] is the circle
-            end = child_node[0].get_top()
-            # Avoid zero-length edges which cause numpy cross product errors
-            if np.linalg.norm(end - start) > 0.01:
-                e.put_start_and_end_on(start, end)
-        except (ValueError, IndexError, AttributeError):
-            pass  # Skip update if geometry is invalid
+        _snap_edge_to_circular_nodes(e, parent_node, child_node)
     edge.clear_updaters()
     edge.add_updater(update_edge)
 
 
+def _bst_children(state: Union[BSTState, 'AVLState']) -> Dict[int, List[int]]:
+    """Dict mapping node_id -> [left, right] child IDs, skipping missing children (BST or AVL)."""
+    return {
+        nid: list(_binary_children(node))
+        for nid, node in state.nodes.items()
+    }
+
+
+def compute_bst_positions(
+    state: BSTState,
+    vertex_spacing: Tuple[float, float] = (1.5, 1.2),
+    layout_scale: float = 2.0,
+    x_offset: float = 1.8,
+) -> Dict[int, np.ndarray]:
+    """
+    Node centers for a BSTState, matching build_bst_graph_from_state.
+    
+    Returns:
+        Dict mapping node_id -> position (empty for an empty tree)
+    """
+    if state.root_id is None or not state.nodes:
+        return {}
+    
+    def compute() -> Dict[int, np.ndarray]:
+        positions = _compute_tree_layout(_bst_children(state), state.root_id, vertex_spacing, layout_scale)
+        # Shift right to avoid overlap with side panel
+        for pos in positions.values():
+            pos[0] += x_offset
+        return positions
+    
+    shape = tuple((nid, node.left, node.right) for nid, node in state.nodes.items())
+    return _cached_layout(('bst', state.root_id, shape, vertex_spacing, layout_scale, x_offset), compute)
+
+
 def build_bst_graph_from_state(
     state: BSTState,
     vertex_spacing: Tuple[float, float] = (1.5, 1.2),
@@ -632,38 +1009,24 @@ def build_bst_graph_from_state(
         return VGroup(), {}, {}
     
     nodes = state.nodes
-    root = state.root_id
 
-    vertices = list(nodes.keys())
-    edges_list = []
-    for nid, node in nodes.items():
-        if node.left is not None:
-            edges_list.append((nid, node.left))
-        if node.right is not None:
-            edges_list.append((nid, node.right))
-
-    # Create Graph just for layout calculation
-    g = Graph(
-        vertices,
-        edges_list,
-        layout="tree",
-        layout_scale=layout_scale,
-        layout_config={
-            "root_vertex": root,
-            "vertex_spacing": vertex_spacing,
-        },
-    )
+    edges_list = [
+        (nid, child_id)
+        for nid, children in _bst_children(state).items()
+        for child_id in children
+    ]
+
+    positions = compute_bst_positions(state, vertex_spacing, layout_scale, x_offset)
 
     # Create circular nodes at calculated positions
     bst_nodes: Dict[int, VGroup] = {}
-    for nid in vertices:
-        node_data = nodes[nid]
-        pos = g[nid].get_center()
-        bst_node = create_circular_node(node_data.key, pos)
+    for nid, node_data in nodes.items():
+        bst_node = create_circular_node(node_data.key, positions[nid])
         bst_node.set_z_index(10)
         bst_nodes[nid] = bst_node
 
-    # Create edges between nodes with updaters
+    # Create edges between nodes (static - animate_bst_transition attaches
+    # updaters only while nodes are actually moving)
     edges_dict: Dict[Tuple[int, int], Line] = {}
     edges = VGroup()
     for parent_id, child_id in edges_list:
@@ -676,16 +1039,12 @@ def build_bst_graph_from_state(
             stroke_width=2,
         )
         edge.set_z_index(5)  # Below nodes (10)
-        _connect_edge_to_circular_nodes(edge, parent_node, child_node)
         edges.add(edge)
         edges_dict[(parent_id, child_id)] = edge
 
-    # Combine into VGroup
+    # Combine into VGroup (positions already include x_offset)
     all_nodes = VGroup(*bst_nodes.values())
     result = VGroup(edges, all_nodes)
-    
-    # Shift entire group right to avoid overlap with side panel
-    result.shift(RIGHT * x_offset)
 
     return result, bst_nodes, edges_dict
 
@@ -698,6 +1057,7 @@ def animate_bst_transition(
     prev_edges: Dict[Tuple[int, int], Line],
     x_offset: float = 1.8,
     run_time: float = 1.0,
+    diff: Optional[BSTDiff] = None,
 ) -> Tuple[Dict[int, VGroup], Dict[Tuple[int, int], Line]]:
     """
     Animate transition between BST states with localized animations.
@@ -711,21 +1071,24 @@ def animate_bst_transition(
         prev_edges: Dict mapping (parent_id, child_id) -> Line mobject
         x_offset: Horizontal offset for tree positioning
         run_time: Animation duration
+        diff: Precomputed diff from prev_state to new_state (e.g. builder.last_diff);
+              computed with diff_bst_states when omitted
     
     Returns:
         Tuple of (new_nodes_dict, new_edges_dict) for next iteration
     """
-    # Reset node colors
-    for node in prev_nodes.values():
-        node[0].set_color(BLUE)  # [0] is the circle
-        node[0].set_fill(BLUE, opacity=0.2)
+    # Reset node colors ([0] is the circle)
+    _reset_shape_colors([node[0] for node in prev_nodes.values()], BLUE, 0.2, BLUE)
     
-    # Build target layout to get positions
-    target_group, target_nodes, target_edges = build_bst_graph_from_state(
-        new_state, x_offset=x_offset
-    )
+    # Nothing changed (duplicate insert, missing delete) - no diff or animation needed
+    if prev_state is new_state or prev_state.signature() == new_state.signature():
+        return prev_nodes, prev_edges
     
-    diff = diff_bst_states(prev_state, new_state)
+    # Target positions only - mobjects are built just for new/modified nodes
+    target_positions = compute_bst_positions(new_state, x_offset=x_offset)
+    
+    if diff is None:
+        diff = diff_bst_states(prev_state, new_state)
     
     node_anims = []
     edge_anims = []
@@ -733,21 +1096,23 @@ def animate_bst_transition(
     new_edges_dict: Dict[Tuple[int, int], Line] = {}
     
     # Handle unchanged nodes - reuse existing mobjects, move if position changed
-    for nid in diff.unchanged_nodes:
-        old_node = prev_nodes[nid]
-        target_node = target_nodes[nid]
-        new_nodes_dict[nid] = old_node
-        
-        old_pos = old_node.get_center()
-        new_pos = target_node.get_center()
-        
-        if np.linalg.norm(new_pos - old_pos) > 0.01:
-            node_anims.append(old_node.animate.move_to(new_pos))
+    unchanged = list(diff.unchanged_nodes)
+    for nid in unchanged:
+        new_nodes_dict[nid] = prev_nodes[nid]
+    if unchanged:
+        # One vectorized distance test (squared, vs 0.01 ** 2) instead of a norm per node
+        old_pos = np.array([prev_nodes[nid].get_center() for nid in unchanged])
+        new_pos = np.array([target_positions[nid] for nid in unchanged])
+        deltas = new_pos - old_pos
+        moved = np.flatnonzero((deltas * deltas).sum(axis=1) > 1e-4)
+        for i in moved:
+            node_anims.append(prev_nodes[unchanged[i]].animate.move_to(new_pos[i]))
     
     # Handle modified nodes - transform to show new key
     for nid in diff.modified_nodes:
         old_node = prev_nodes[nid]
-        target_node = target_nodes[nid]
+        target_node = create_circular_node(new_state.nodes[nid].key, target_positions[nid])
+        target_node.set_z_index(10)
         
         # Transform old node into new visual
         node_anims.append(Transform(old_node, target_node))
@@ -755,7 +1120,8 @@ def animate_bst_transition(
     
     # Handle new nodes - use FadeIn to preserve fill_opacity
     for nid in diff.new_nodes:
-        target_node = target_nodes[nid].copy()
+        target_node = create_circular_node(new_state.nodes[nid].key, target_positions[nid])
+        target_node.set_z_index(10)
         new_nodes_dict[nid] = target_node
         node_anims.append(FadeIn(target_node))
     
@@ -764,13 +1130,11 @@ def animate_bst_transition(
         old_node = prev_nodes[nid]
         node_anims.append(FadeOut(old_node))
     
-    # Handle edges
-    old_edge_keys = set(prev_edges.keys())
-    new_edge_keys = set(target_edges.keys())
-    
-    kept_edges = old_edge_keys & new_edge_keys
-    added_edges = new_edge_keys - old_edge_keys
-    removed_edges = old_edge_keys - new_edge_keys
+    # Handle edges - the diff lists the edges that changed; every other
+    # edge on screen is kept
+    added_edges = diff.added_edges
+    removed_edges = diff.removed_edges
+    kept_edges = prev_edges.keys() - removed_edges
     
     # Kept edges - reattach updater so they follow moved/transformed nodes
     for ek in kept_edges:
@@ -807,14 +1171,20 @@ def animate_bst_transition(
     
     # Play all animations together
     if node_anims or edge_anims:
-        scene.play(
-            AnimationGroup(*node_anims, *edge_anims, lag_ratio=0.0),
-            run_time=run_time,
-        )
+        scene.play(*node_anims, *edge_anims, run_time=run_time)
+    
+    # Nodes have settled - pin final endpoints and drop the per-frame updaters
+    # so edges cost nothing during waits and highlight-only animations
+    for (parent_id, child_id), edge in new_edges_dict.items():
+        edge.clear_updaters()
+        _snap_edge_to_circular_nodes(edge, new_nodes_dict[parent_id], new_nodes_dict[child_id])
     
     return new_nodes_dict, new_edges_dict
 
 
+_BTREE_NODE_HEIGHT = 0.8
+
+
 class BTreeNode(VGroup):
     """Visual B-tree node with rectangular shape and key labels."""
     
@@ -823,14 +1193,15 @@ class BTreeNode(VGroup):
         rect_width = max(2.0, len(keys) * 0.8 + 0.4)
         rect = Rectangle(
             width=rect_width,
-            height=0.8,
+            height=_BTREE_NODE_HEIGHT,
             color=BLUE,
             fill_opacity=0.2,
             fill_color=BLUE,
             stroke_width=2,
         )
+        # Key labels are copies of cached prototypes - rebuilt nodes reuse shaped glyphs
         key_texts = VGroup(*[
-            Text(str(k), font_size=20, color=WHITE, disable_ligatures=True)
+            make_text(str(k), font_size=20, color=WHITE, disable_ligatures=True)
             for k in keys
         ]).arrange(RIGHT, buff=0.2)
         key_texts.move_to(rect)
@@ -845,17 +1216,62 @@ class BTreeNode(VGroup):
         self.set_z_index(10)
 
 
+@lru_cache(maxsize=256)
+def _proto_btree_node(keys: Tuple[int, ...]) -> BTreeNode:
+    """Build a BTreeNode once per key tuple; callers get copies via make_btree_node"""
+    return BTreeNode(keys)
+
+
+def make_btree_node(keys) -> BTreeNode:
+    """Independent BTreeNode for keys, copied from a cached prototype."""
+    return _proto_btree_node(tuple(keys)).copy()
+
+
+def _snap_edge_to_nodes(edge: Line, parent_node: 'BTreeNode', child_node: 'BTreeNode') -> None:
+    """Set the edge endpoints so it connects the given parent/child nodes."""
+    # Key labels sit inside the rectangle, so the rectangle alone bounds the node
+    start = parent_node.rect.get_bottom()
+    end = child_node.rect.get_top()
+    # Most edges are at rest on most frames - skip re-orienting the line then
+    if not (np.array_equal(start, edge.get_start()) and np.array_equal(end, edge.get_end())):
+        edge.put_start_and_end_on(start, end)
+
+
 def _connect_edge_to_nodes(edge: Line, parent_node: 'BTreeNode', child_node: 'BTreeNode') -> None:
     """Attach an updater so the edge always connects the given parent/child nodes."""
     def update_edge(e: Line) -> None:
-        e.put_start_and_end_on(
-            parent_node.get_bottom(),
-            child_node.get_top(),
-        )
+        _snap_edge_to_nodes(e, parent_node, child_node)
     edge.clear_updaters()
     edge.add_updater(update_edge)
 
 
+def compute_btree_positions(
+    state: BTreeState,
+    vertex_spacing: Tuple[float, float] = (2.8, 1.5),
+    layout_scale: float = 2.0,
+    x_offset: float = 1.8,
+) -> Dict[int, np.ndarray]:
+    """
+    Node centers for a BTreeState, matching build_btree_graph_from_state.
+    
+    Returns:
+        Dict mapping node_id -> position (empty for an empty tree)
+    """
+    if state.root_id is None or not state.nodes:
+        return {}
+    
+    def compute() -> Dict[int, np.ndarray]:
+        children_of = {nid: list(node.children) for nid, node in state.nodes.items()}
+        positions = _compute_tree_layout(children_of, state.root_id, vertex_spacing, layout_scale)
+        # Shift right to avoid overlap with side panel
+        for pos in positions.values():
+            pos[0] += x_offset
+        return positions
+    
+    shape = tuple((nid, node.children) for nid, node in state.nodes.items())
+    return _cached_layout(('btree', state.root_id, shape, vertex_spacing, layout_scale, x_offset), compute)
+
+
 def build_btree_graph_from_state(
     state: BTreeState,
     vertex_spacing: Tuple[float, float] = (2.8, 1.5),
@@ -877,43 +1293,32 @@ def build_btree_graph_from_state(
                   dict mapping (parent_id, child_id) -> Line edge)
     """
     nodes = state.nodes
-    root = state.root_id
-
-    vertices = list(nodes.keys())
-    edges_list = []
-    for nid, node in nodes.items():
-        for child_id in node.children:
-            edges_list.append((nid, child_id))
-
-    # Create Graph just for layout calculation
-    g = Graph(
-        vertices,
-        edges_list,
-        layout="tree",
-        layout_scale=layout_scale,
-        layout_config={
-            "root_vertex": root,
-            "vertex_spacing": vertex_spacing,
-        },
-    )
+    positions = compute_btree_positions(state, vertex_spacing, layout_scale, x_offset)
 
-    # Create BTreeNodes at calculated positions
+    # Create BTreeNodes at calculated positions, collecting edges in the same pass
     btree_nodes: Dict[int, BTreeNode] = {}
-    for nid in vertices:
-        node_data = nodes[nid]
-        bt_node = BTreeNode(node_data.keys)
-        bt_node.move_to(g[nid].get_center())
+    edges_list = []
+    for nid, node_data in nodes.items():
+        bt_node = make_btree_node(node_data.keys)
+        bt_node.move_to(positions[nid])
         btree_nodes[nid] = bt_node
+        edges_list.extend((nid, child_id) for child_id in node_data.children)
 
-    # Create edges between BTreeNodes with updaters
+    # Create edges between BTreeNodes with updaters. Each rectangle is centred
+    # on its layout position, so all endpoints come from one array operation
+    # instead of a bounding-box walk per node
     edges_dict: Dict[Tuple[int, int], Line] = {}
     edges = VGroup()
-    for parent_id, child_id in edges_list:
+    if edges_list:
+        half_height = np.array([0.0, _BTREE_NODE_HEIGHT / 2, 0.0])
+        starts = np.array([positions[parent_id] for parent_id, _ in edges_list]) - half_height
+        ends = np.array([positions[child_id] for _, child_id in edges_list]) + half_height
+    for i, (parent_id, child_id) in enumerate(edges_list):
         parent_node = btree_nodes[parent_id]
         child_node = btree_nodes[child_id]
         edge = Line(
-            parent_node.get_bottom(),
-            child_node.get_top(),
+            starts[i],
+            ends[i],
             color=WHITE,
             stroke_width=2,
         )
@@ -925,9 +1330,6 @@ def build_btree_graph_from_state(
     # Combine into VGroup
     all_nodes = VGroup(*btree_nodes.values())
     result = VGroup(edges, all_nodes)
-    
-    # Shift entire group right to avoid overlap with side panel
-    result.shift(RIGHT * x_offset)
 
     return result, btree_nodes, edges_dict
 
@@ -955,6 +1357,7 @@ def animate_btree_transition(
     prev_edges: Dict[Tuple[int, int], Line],
     x_offset: float = 1.8,
     run_time: float = 1.0,
+    diff: Optional[BTreeDiff] = None,
 ) -> Tuple[Dict[int, 'BTreeNode'], Dict[Tuple[int, int], Line]]:
     """
     Animate transition between B-tree states with localized animations.
@@ -968,20 +1371,29 @@ def animate_btree_transition(
         prev_edges: Dict mapping (parent_id, child_id) -> Line mobject
         x_offset: Horizontal offset for tree positioning
         run_time: Animation duration
+        diff: Precomputed diff from prev_state to new_state (e.g. builder.last_diff);
+              computed with diff_btree_states when omitted
     
     Returns:
         Tuple of (new_nodes_dict, new_edges_dict) for next iteration
     """
-    for node in prev_nodes.values():
-        node.rect.set_color(BLUE)
-        node.rect.set_fill(BLUE, opacity=0.2)
+    # Reset node colors
+    _reset_shape_colors([node.rect for node in prev_nodes.values()], BLUE, 0.2, BLUE)
     
-    # Build target layout to get positions
-    target_group, target_nodes, target_edges = build_btree_graph_from_state(
-        new_state, x_offset=x_offset
-    )
+    # Same snapshot passed twice - nothing to diff or animate
+    if prev_state is new_state:
+        return prev_nodes, prev_edges
+    
+    if diff is None:
+        diff = diff_btree_states(prev_state, new_state)
+    
+    # Nothing changed (equal states) - same layout, no animation
+    if not (diff.new_nodes or diff.removed_nodes or diff.modified_nodes or
+            diff.added_edges or diff.removed_edges):
+        return prev_nodes, prev_edges
     
-    diff = diff_btree_states(prev_state, new_state)
+    # Target positions only - mobjects are built just for new/modified nodes
+    target_positions = compute_btree_positions(new_state, x_offset=x_offset)
     
     node_anims = []
     edge_anims = []
@@ -989,29 +1401,60 @@ def animate_btree_transition(
     new_edges_dict: Dict[Tuple[int, int], Line] = {}
     
     # Handle unchanged nodes - reuse existing mobjects, move if position changed
-    for nid in diff.unchanged_nodes:
-        old_node = prev_nodes[nid]
-        target_node = target_nodes[nid]
-        new_nodes_dict[nid] = old_node
-        
-        old_pos = old_node.get_center()
-        new_pos = target_node.get_center()
-        
-        if np.linalg.norm(new_pos - old_pos) > 0.01:
-            node_anims.append(old_node.animate.move_to(new_pos))
+    unchanged = list(diff.unchanged_nodes)
+    for nid in unchanged:
+        new_nodes_dict[nid] = prev_nodes[nid]
+    if unchanged:
+        # One vectorized distance test (squared, vs 0.01 ** 2) instead of a norm per node
+        old_pos = np.array([prev_nodes[nid].get_center() for nid in unchanged])
+        new_pos = np.array([target_positions[nid] for nid in unchanged])
+        deltas = new_pos - old_pos
+        moved = np.flatnonzero((deltas * deltas).sum(axis=1) > 1e-4)
+        for i in moved:
+            node_anims.append(prev_nodes[unchanged[i]].animate.move_to(new_pos[i]))
     
     # Handle modified nodes - transform to show new keys
     for nid in diff.modified_nodes:
         old_node = prev_nodes[nid]
-        target_node = target_nodes[nid]
-        
-        # Transform old node into new visual
-        node_anims.append(Transform(old_node, target_node))
+        target_node = make_btree_node(new_state.nodes[nid].keys).move_to(target_positions[nid])
         new_nodes_dict[nid] = old_node
+        
+        if abs(old_node.rect.width - target_node.rect.width) > 1e-6:
+            # Rectangle resized - transform the whole node
+            node_anims.append(Transform(old_node, target_node))
+        else:
+            # Same rectangle: just move it and transform the key labels
+            old_pos = old_node.rect.get_center()
+            new_pos = target_node.rect.get_center()
+            dx = new_pos[0] - old_pos[0]
+            dy = new_pos[1] - old_pos[1]
+            dz = new_pos[2] - old_pos[2]
+            if dx * dx + dy * dy + dz * dz > 1e-4:
+                node_anims.append(old_node.rect.animate.move_to(new_pos))
+            old_keys = prev_state.nodes[nid].keys
+            new_keys = new_state.nodes[nid].keys
+            if len(old_keys) != len(new_keys):
+                node_anims.append(Transform(old_node.key_texts, target_node.key_texts))
+                continue
+            # Same key count: transform only the labels whose key changed and
+            # slide the others to their (possibly re-centred) place
+            for old_key, new_key, old_text, new_text in zip(
+                old_keys, new_keys, old_node.key_texts, target_node.key_texts
+            ):
+                if old_key != new_key:
+                    node_anims.append(Transform(old_text, new_text))
+                else:
+                    old_pos = old_text.get_center()
+                    new_pos = new_text.get_center()
+                    dx = new_pos[0] - old_pos[0]
+                    dy = new_pos[1] - old_pos[1]
+                    dz = new_pos[2] - old_pos[2]
+                    if dx * dx + dy * dy + dz * dz > 1e-4:
+                        node_anims.append(old_text.animate.move_to(new_pos))
     
     # Handle new nodes - use FadeIn to preserve fill_opacity
     for nid in diff.new_nodes:
-        target_node = target_nodes[nid].copy()
+        target_node = make_btree_node(new_state.nodes[nid].keys).move_to(target_positions[nid])
         new_nodes_dict[nid] = target_node
         node_anims.append(FadeIn(target_node))
     
@@ -1020,13 +1463,11 @@ def animate_btree_transition(
         old_node = prev_nodes[nid]
         node_anims.append(FadeOut(old_node))
     
-    # Handle edges
-    old_edge_keys = set(prev_edges.keys())
-    new_edge_keys = set(target_edges.keys())
-    
-    kept_edges = old_edge_keys & new_edge_keys
-    added_edges = new_edge_keys - old_edge_keys
-    removed_edges = old_edge_keys - new_edge_keys
+    # Handle edges - the diff lists the edges that changed; every other
+    # edge on screen is kept
+    added_edges = diff.added_edges
+    removed_edges = diff.removed_edges
+    kept_edges = prev_edges.keys() - removed_edges
     
     # Kept edges - reattach updater so they follow moved/transformed nodes
     for ek in kept_edges:
@@ -1063,10 +1504,7 @@ def animate_btree_transition(
     
     # Play all animations together
     if node_anims or edge_anims:
-        scene.play(
-            AnimationGroup(*node_anims, *edge_anims, lag_ratio=0.0),
-            run_time=run_time,
-        )
+        scene.play(*node_anims, *edge_anims, run_time=run_time)
     
     return new_nodes_dict, new_edges_dict
 
@@ -1078,7 +1516,7 @@ def animate_btree_transition(
 # AVL Tree Support
 # =============================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AVLNodeData:
     id: int
     key: int
@@ -1089,14 +1527,14 @@ class AVLNodeData:
     balance: int = 0  # bf = height(left) - height(right)
 
 
-@dataclass
+@dataclass(slots=True)
 class AVLState:
     """Immutable snapshot of an AVL tree at a given step."""
     nodes: Dict[int, AVLNodeData]
     root_id: Optional[int]
 
 
-@dataclass
+@dataclass(slots=True)
 class AVLRotationInfo:
     """Info about a rotation that occurred during an operation."""
     pivot_id: int              # the unbalanced node z
@@ -1105,19 +1543,22 @@ class AVLRotationInfo:
     rotation_type: str         # "LL", "RR", "LR", "RL"
 
 
-@dataclass
+@dataclass(slots=True)
 class AVLStateDiff:
     """Diff between two AVL states for localized animations."""
     new_nodes: set
     removed_nodes: set
     modified_nodes: set
     unchanged_nodes: set
+    added_edges: set        # (parent_id, child_id) in new state only
+    removed_edges: set      # (parent_id, child_id) in old state only
 
 
 def diff_avl_states(old: AVLState, new: AVLState) -> AVLStateDiff:
     """Compute structural diff between two AVL states."""
-    old_ids = set(old.nodes.keys()) if old.nodes else set()
-    new_ids = set(new.nodes.keys()) if new.nodes else set()
+    # Set ops on the dict key views build each result set in one C call
+    old_ids = old.nodes.keys()
+    new_ids = new.nodes.keys()
 
     common = old_ids & new_ids
     new_nodes = new_ids - old_ids
@@ -1125,26 +1566,42 @@ def diff_avl_states(old: AVLState, new: AVLState) -> AVLStateDiff:
 
     modified_nodes = set()
     unchanged_nodes = set()
+    added_edges = set()
+    removed_edges = set()
     for nid in common:
         o = old.nodes[nid]
         n = new.nodes[nid]
-        if (o.key == n.key and
-            o.left == n.left and
-            o.right == n.right and
-            o.balance == n.balance and
-            o.height == n.height):
+        if o is n:
+            # Shared node record - builder snapshots reuse untouched nodes
+            unchanged_nodes.add(nid)
+        elif (o.key == n.key and
+              o.left == n.left and
+              o.right == n.right and
+              o.balance == n.balance and
+              o.height == n.height):
             unchanged_nodes.add(nid)
         else:
             modified_nodes.add(nid)
+            _diff_child_edges(nid, _binary_children(o), _binary_children(n), added_edges, removed_edges)
+    for nid in new_nodes:
+        _diff_child_edges(nid, (), _binary_children(new.nodes[nid]), added_edges, removed_edges)
+    for nid in removed_nodes:
+        _diff_child_edges(nid, _binary_children(old.nodes[nid]), (), added_edges, removed_edges)
 
     return AVLStateDiff(
         new_nodes=new_nodes,
         removed_nodes=removed_nodes,
         modified_nodes=modified_nodes,
         unchanged_nodes=unchanged_nodes,
+        added_edges=added_edges,
+        removed_edges=removed_edges,
     )
 
 
+# Rotation names by avl_rebalance_path rotation code
+_AVL_ROTATION_TYPES = {ROT_LL: "LL", ROT_RR: "RR", ROT_LR: "LR", ROT_RL: "RL"}
+
+
 class AVLBuilder:
     """Pure Python AVL tree builder with no Manim dependencies."""
 
@@ -1152,176 +1609,64 @@ class AVLBuilder:
         self.reset()
 
     def reset(self):
-        self._next_id = 0
-        self._nodes: Dict[int, AVLNodeData] = {}
+        # Structure-of-arrays storage indexed by node id; _NIL marks a missing link
+        self._keys = array('q')
+        self._left = array('q')
+        self._right = array('q')
+        self._parent = array('q')
+        self._heights = array('q')
+        self._balance = array('q')  # bf = height(left) - height(right)
+        self._alive = bytearray()   # 0 once a node has been deleted
         self._root_id: Optional[int] = None
         self.last_rotation: Optional[AVLRotationInfo] = None
-
-    def _new_node(self, key: int, parent: Optional[int] = None) -> AVLNodeData:
-        node = AVLNodeData(id=self._next_id, key=key, parent=parent)
-        self._nodes[self._next_id] = node
-        self._next_id += 1
-        return node
-
-    def _height(self, node_id: Optional[int]) -> int:
-        if node_id is None:
-            return 0
-        return self._nodes[node_id].height
-
-    def _update_height_and_balance(self, node_id: int) -> None:
-        node = self._nodes[node_id]
-        left_h = self._height(node.left)
-        right_h = self._height(node.right)
-        node.height = 1 + max(left_h, right_h)
-        node.balance = left_h - right_h
-
-    def _rotate_left(self, z_id: int) -> int:
-        r"""
-        Left rotation around z. Returns new subtree root (y).
-        
-             z                y
-            / \              / \
-           T1  y    =>      z   T3
-              / \          / \
-             T2  T3       T1  T2
-        """
-        z = self._nodes[z_id]
-        y_id = z.right
-        y = self._nodes[y_id]
-        t2_id = y.left
-
-        # Perform rotation
-        y.left = z_id
-        z.right = t2_id
-
-        # Update parent pointers
-        y.parent = z.parent
-        z.parent = y_id
-        if t2_id is not None:
-            self._nodes[t2_id].parent = z_id
-
-        # Update root if needed
-        if y.parent is None:
-            self._root_id = y_id
-        else:
-            parent = self._nodes[y.parent]
-            if parent.left == z_id:
-                parent.left = y_id
-            else:
-                parent.right = y_id
-
-        # Update heights (z first, then y)
-        self._update_height_and_balance(z_id)
-        self._update_height_and_balance(y_id)
-
-        return y_id
-
-    def _rotate_right(self, z_id: int) -> int:
-        r"""
-        Right rotation around z. Returns new subtree root (y).
-        
-             z                y
-            / \              / \
-           y   T3   =>      T1  z
-          / \                  / \
-         T1  T2               T2  T3
-        """
-        z = self._nodes[z_id]
-        y_id = z.left
-        y = self._nodes[y_id]
-        t2_id = y.right
-
-        # Perform rotation
-        y.right = z_id
-        z.left = t2_id
-
-        # Update parent pointers
-        y.parent = z.parent
-        z.parent = y_id
-        if t2_id is not None:
-            self._nodes[t2_id].parent = z_id
-
-        # Update root if needed
-        if y.parent is None:
-            self._root_id = y_id
-        else:
-            parent = self._nodes[y.parent]
-            if parent.left == z_id:
-                parent.left = y_id
-            else:
-                parent.right = y_id
-
-        # Update heights (z first, then y)
-        self._update_height_and_balance(z_id)
-        self._update_height_and_balance(y_id)
-
-        return y_id
-
-    def _rebalance_path(self, start_id: Optional[int]) -> None:
+        # Snapshot node dict shared between states; only dirty ids are rebuilt
+        self._state_nodes: Dict[int, AVLNodeData] = {}
+        self._dirty: set = set()
+        # Diff from the previous snapshot to the latest one, built from the dirty ids
+        self.last_diff: Optional[AVLStateDiff] = None
+
+    def _new_node(self, key: int, parent: int = _NIL) -> int:
+        """Append a node to the arrays and return its id."""
+        self._keys.append(key)
+        self._left.append(_NIL)
+        self._right.append(_NIL)
+        self._parent.append(parent)
+        self._heights.append(1)
+        self._balance.append(0)
+        self._alive.append(1)
+        node_id = len(self._keys) - 1
+        self._dirty.add(node_id)
+        return node_id
+
+    def _remove_node(self, node_id: int) -> None:
+        self._alive[node_id] = 0
+        self._dirty.add(node_id)
+
+    def _rebalance_path(self, start_id: int) -> None:
         """
         Walk up from start_id to root, updating heights and rebalancing.
         Sets self.last_rotation to info about the first rotation performed.
         """
-        self.last_rotation = None
-        current_id = start_id
-
-        while current_id is not None:
-            self._update_height_and_balance(current_id)
-            node = self._nodes[current_id]
-            balance = node.balance
-
-            if balance > 1:
-                # Left-heavy
-                left_node = self._nodes[node.left]
-                if left_node.balance >= 0:
-                    # LL case - single right rotation
-                    if self.last_rotation is None:
-                        self.last_rotation = AVLRotationInfo(
-                            pivot_id=current_id,
-                            child_id=node.left,
-                            grandchild_id=None,
-                            rotation_type="LL"
-                        )
-                    current_id = self._rotate_right(current_id)
-                else:
-                    # LR case - left rotation on left child, then right rotation
-                    if self.last_rotation is None:
-                        self.last_rotation = AVLRotationInfo(
-                            pivot_id=current_id,
-                            child_id=node.left,
-                            grandchild_id=left_node.right,
-                            rotation_type="LR"
-                        )
-                    self._rotate_left(node.left)
-                    current_id = self._rotate_right(current_id)
-
-            elif balance < -1:
-                # Right-heavy
-                right_node = self._nodes[node.right]
-                if right_node.balance <= 0:
-                    # RR case - single left rotation
-                    if self.last_rotation is None:
-                        self.last_rotation = AVLRotationInfo(
-                            pivot_id=current_id,
-                            child_id=node.right,
-                            grandchild_id=None,
-                            rotation_type="RR"
-                        )
-                    current_id = self._rotate_left(current_id)
-                else:
-                    # RL case - right rotation on right child, then left rotation
-                    if self.last_rotation is None:
-                        self.last_rotation = AVLRotationInfo(
-                            pivot_id=current_id,
-                            child_id=node.right,
-                            grandchild_id=right_node.left,
-                            rotation_type="RL"
-                        )
-                    self._rotate_right(node.right)
-                    current_id = self._rotate_left(current_id)
-
-            # Move up to parent
-            current_id = self._nodes[current_id].parent
+        root, touched, pivot, child, grandchild, rotation = avl_rebalance_path(
+            start_id,
+            _NIL if self._root_id is None else self._root_id,
+            as_int64(self._left),
+            as_int64(self._right),
+            as_int64(self._parent),
+            as_int64(self._heights),
+            as_int64(self._balance),
+        )
+        self._root_id = None if root == _NIL else int(root)
+        self._dirty.update(touched.tolist())
+        if rotation == ROT_NONE:
+            self.last_rotation = None
+        else:
+            self.last_rotation = AVLRotationInfo(
+                pivot_id=int(pivot),
+                child_id=int(child),
+                grandchild_id=None if grandchild == _NIL else int(grandchild),
+                rotation_type=_AVL_ROTATION_TYPES[rotation],
+            )
 
     def insert_and_snapshot(self, key: int) -> Tuple[AVLState, int]:
         """
@@ -1330,28 +1675,30 @@ class AVLBuilder:
         self.last_rotation = None
 
         if self._root_id is None:
-            root = self._new_node(key)
-            self._root_id = root.id
-            return self._snapshot(), root.id
+            self._root_id = self._new_node(key)
+            return self._snapshot(), self._root_id
 
         # BST insert
+        keys, left, right = self._keys, self._left, self._right
         current_id = self._root_id
         while True:
-            current = self._nodes[current_id]
-            if key < current.key:
-                if current.left is None:
-                    new_node = self._new_node(key, parent=current_id)
-                    current.left = new_node.id
+            current_key = keys[current_id]
+            if key < current_key:
+                if left[current_id] == _NIL:
+                    new_id = self._new_node(key, parent=current_id)
+                    left[current_id] = new_id
+                    self._dirty.add(current_id)
                     self._rebalance_path(current_id)
-                    return self._snapshot(), new_node.id
-                current_id = current.left
-            elif key > current.key:
-                if current.right is None:
-                    new_node = self._new_node(key, parent=current_id)
-                    current.right = new_node.id
+                    return self._snapshot(), new_id
+                current_id = left[current_id]
+            elif key > current_key:
+                if right[current_id] == _NIL:
+                    new_id = self._new_node(key, parent=current_id)
+                    right[current_id] = new_id
+                    self._dirty.add(current_id)
                     self._rebalance_path(current_id)
-                    return self._snapshot(), new_node.id
-                current_id = current.right
+                    return self._snapshot(), new_id
+                current_id = right[current_id]
             else:
                 # Duplicate key
                 return self._snapshot(), current_id
@@ -1367,142 +1714,141 @@ class AVLBuilder:
             return self._snapshot(), "not_found"
 
         # Find the node to delete
-        node_id = self._root_id
-        while node_id is not None:
-            node = self._nodes[node_id]
-            if key == node.key:
-                break
-            elif key < node.key:
-                node_id = node.left
-            else:
-                node_id = node.right
-
-        if node_id is None:
+        keys, left, right, parent = self._keys, self._left, self._right, self._parent
+        node_id = bst_find(
+            self._root_id, as_int64(keys), as_int64(left), as_int64(right), key
+        )
+        if node_id == _NIL:
             return self._snapshot(), "not_found"
 
-        node = self._nodes[node_id]
-        parent_id = node.parent
-
-        # Case 1: Leaf node
-        if node.left is None and node.right is None:
-            if parent_id is None:
-                self._root_id = None
-            else:
-                parent = self._nodes[parent_id]
-                if parent.left == node_id:
-                    parent.left = None
-                else:
-                    parent.right = None
-            del self._nodes[node_id]
-            self._rebalance_path(parent_id)
-            return self._snapshot(), "leaf"
+        parent_id = parent[node_id]
+        node_left = left[node_id]
+        node_right = right[node_id]
 
-        # Case 2: One child
-        if node.left is None or node.right is None:
-            child_id = node.left if node.left is not None else node.right
-            child = self._nodes[child_id]
-            child.parent = parent_id
+        # Case 1 and 2: leaf or one child - splice the (possibly absent) child into the parent
+        if node_left == _NIL or node_right == _NIL:
+            child_id = node_left if node_left != _NIL else node_right
+            if child_id != _NIL:
+                parent[child_id] = parent_id
+                self._dirty.add(child_id)
 
-            if parent_id is None:
-                self._root_id = child_id
+            if parent_id == _NIL:
+                self._root_id = None if child_id == _NIL else child_id
             else:
-                parent = self._nodes[parent_id]
-                if parent.left == node_id:
-                    parent.left = child_id
+                if left[parent_id] == node_id:
+                    left[parent_id] = child_id
                 else:
-                    parent.right = child_id
+                    right[parent_id] = child_id
+                self._dirty.add(parent_id)
 
-            del self._nodes[node_id]
+            self._remove_node(node_id)
             self._rebalance_path(parent_id)
-            return self._snapshot(), "one_child"
+            return self._snapshot(), "leaf" if child_id == _NIL else "one_child"
 
         # Case 3: Two children - find inorder successor
-        successor_id = node.right
-        while self._nodes[successor_id].left is not None:
-            successor_id = self._nodes[successor_id].left
+        successor_id = node_right
+        while left[successor_id] != _NIL:
+            successor_id = left[successor_id]
 
-        successor = self._nodes[successor_id]
-        successor_parent_id = successor.parent
+        successor_parent_id = parent[successor_id]
+        successor_right = right[successor_id]
 
         # Copy successor's key to node being deleted
-        node.key = successor.key
+        keys[node_id] = keys[successor_id]
+        self._dirty.add(node_id)
 
         # Delete successor (has at most one child - right child)
         if successor_parent_id == node_id:
             # Successor is immediate right child
-            node.right = successor.right
-            if successor.right is not None:
-                self._nodes[successor.right].parent = node_id
+            right[node_id] = successor_right
+            if successor_right != _NIL:
+                parent[successor_right] = node_id
+                self._dirty.add(successor_right)
             rebalance_start = node_id
         else:
             # Successor is deeper
-            parent = self._nodes[successor_parent_id]
-            parent.left = successor.right
-            if successor.right is not None:
-                self._nodes[successor.right].parent = successor_parent_id
+            left[successor_parent_id] = successor_right
+            self._dirty.add(successor_parent_id)
+            if successor_right != _NIL:
+                parent[successor_right] = successor_parent_id
+                self._dirty.add(successor_right)
             rebalance_start = successor_parent_id
 
-        del self._nodes[successor_id]
+        self._remove_node(successor_id)
         self._rebalance_path(rebalance_start)
         return self._snapshot(), "two_children"
 
     def get_insertion_path(self, key: int) -> List[int]:
         """Get the path from root to where a key would be inserted (without inserting)."""
-        if self._root_id is None:
-            return []
-        path = []
-        current_id = self._root_id
-        while current_id is not None:
-            path.append(current_id)
-            current = self._nodes[current_id]
-            if key < current.key:
-                if current.left is None:
-                    break
-                current_id = current.left
-            elif key > current.key:
-                if current.right is None:
-                    break
-                current_id = current.right
-            else:
-                break  # Key already exists
-        return path
+        return self.search_path(key)
 
     def search_path(self, key: int) -> List[int]:
         """Get the path from root to a key (or where it would be)."""
         if self._root_id is None:
             return []
-        path = []
-        current_id = self._root_id
-        while current_id is not None:
-            path.append(current_id)
-            current = self._nodes[current_id]
-            if key == current.key:
-                break
-            elif key < current.key:
-                current_id = current.left
-            else:
-                current_id = current.right
-        return path
+        return bst_descent_path(
+            self._root_id, as_int64(self._keys), as_int64(self._left), as_int64(self._right), key
+        ).tolist()
 
     def tree_height(self) -> int:
         """Return the height of the tree (0 for empty tree)."""
         if self._root_id is None:
             return 0
-        return self._nodes[self._root_id].height
+        return self._heights[self._root_id]
 
     def _snapshot(self) -> AVLState:
-        nodes_copy = {}
-        for nid, node in self._nodes.items():
-            nodes_copy[nid] = AVLNodeData(
-                id=node.id,
-                key=node.key,
-                left=node.left,
-                right=node.right,
-                parent=node.parent,
-                height=node.height,
-                balance=node.balance,
+        # Untouched nodes keep their node data from the previous snapshot;
+        # snapshot copies are never mutated, so states can share them
+        keys, left, right, parent = self._keys, self._left, self._right, self._parent
+        heights, balance = self._heights, self._balance
+        state_nodes = self._state_nodes
+        new_nodes = set()
+        modified_nodes = set()
+        removed_nodes = set()
+        added_edges = set()
+        removed_edges = set()
+        for nid in self._dirty:
+            old = state_nodes.get(nid)
+            old_children = () if old is None else _binary_children(old)
+            if not self._alive[nid]:
+                if old is not None:
+                    del state_nodes[nid]
+                    removed_nodes.add(nid)
+                    _diff_child_edges(nid, old_children, (), added_edges, removed_edges)
+                continue
+            l = left[nid]
+            r = right[nid]
+            p = parent[nid]
+            node = AVLNodeData(
+                id=nid,
+                key=keys[nid],
+                left=None if l == _NIL else l,
+                right=None if r == _NIL else r,
+                parent=None if p == _NIL else p,
+                height=heights[nid],
+                balance=balance[nid],
             )
-        return AVLState(nodes=nodes_copy, root_id=self._root_id)
+            state_nodes[nid] = node
+            if old is None:
+                new_nodes.add(nid)
+            elif (old.key != node.key or
+                  old.left != node.left or
+                  old.right != node.right or
+                  old.balance != node.balance or
+                  old.height != node.height):
+                modified_nodes.add(nid)
+            _diff_child_edges(nid, old_children, _binary_children(node), added_edges, removed_edges)
+        self._dirty.clear()
+
+        self.last_diff = AVLStateDiff(
+            new_nodes=new_nodes,
+            removed_nodes=removed_nodes,
+            modified_nodes=modified_nodes,
+            unchanged_nodes=state_nodes.keys() - new_nodes - modified_nodes,
+            added_edges=added_edges,
+            removed_edges=removed_edges,
+        )
+        return AVLState(nodes=state_nodes.copy(), root_id=self._root_id)
 
 
 # =============================================================================
@@ -1516,8 +1862,9 @@ def create_avl_node_mobject(key: int, balance: int, position) -> VGroup:
     """
     # Create circle directly (not extracting from another VGroup)
     circle = Circle(radius=0.4, color=BLUE, fill_opacity=0.3, fill_color=BLUE, stroke_width=2)
-    key_text = Text(str(key), font_size=24, color=WHITE, disable_ligatures=True)
-    bf_text = Text(f"bf={balance}", font_size=14, color=YELLOW, disable_ligatures=True)
+    # Labels are copies of cached prototypes - keys and balance factors repeat across states
+    key_text = make_text(str(key), font_size=24, color=WHITE, disable_ligatures=True)
+    bf_text = make_text(f"bf={balance}", font_size=14, color=YELLOW, disable_ligatures=True)
     
     # Position elements relative to circle center
     key_text.move_to(circle.get_center())
@@ -1530,6 +1877,32 @@ def create_avl_node_mobject(key: int, balance: int, position) -> VGroup:
     return node
 
 
+def compute_avl_positions(
+    state: AVLState,
+    base_spacing: float = 2.0,
+    level_spacing: float = 1.2,
+    root_y: float = 2.5,
+) -> Dict[int, np.ndarray]:
+    """
+    Node centers for an AVLState, matching build_avl_graph_from_state.
+    
+    Returns:
+        Dict mapping node_id -> position (empty for an empty tree)
+    """
+    if state.root_id is None or not state.nodes:
+        return {}
+
+    def compute() -> Dict[int, np.ndarray]:
+        # Fit the layout to base_spacing, then adjust for level spacing
+        positions = _compute_tree_layout(_bst_children(state), state.root_id, layout_scale=base_spacing)
+        for pos in positions.values():
+            pos[1] = pos[1] * level_spacing / 2 + root_y
+        return positions
+
+    shape = tuple((nid, node.left, node.right) for nid, node in state.nodes.items())
+    return _cached_layout(('avl', state.root_id, shape, base_spacing, level_spacing, root_y), compute)
+
+
 def build_avl_graph_from_state(
     state: AVLState,
     base_spacing: float = 2.0,
@@ -1537,7 +1910,7 @@ def build_avl_graph_from_state(
     root_y: float = 2.5,
 ) -> Tuple[VGroup, Dict[int, VGroup], Dict[Tuple[int, int], Line]]:
     """
-    Build a visual graph from an AVLState using Graph layout for positioning.
+    Build a visual graph from an AVLState using tree layout for positioning.
     
     Returns:
         (graph_group, nodes_dict, edges_dict)
@@ -1548,7 +1921,7 @@ def build_avl_graph_from_state(
     if state.root_id is None or not state.nodes:
         return VGroup(), {}, {}
 
-    # Build edge list for Graph layout
+    # Parent -> child edges
     edge_list = []
     for nid, node in state.nodes.items():
         if node.left is not None:
@@ -1556,22 +1929,7 @@ def build_avl_graph_from_state(
         if node.right is not None:
             edge_list.append((nid, node.right))
 
-    vertex_list = list(state.nodes.keys())
-
-    # Use Manim's Graph for layout computation
-    temp_graph = Graph(
-        vertex_list,
-        edge_list,
-        layout="tree",
-        root_vertex=state.root_id,
-        layout_scale=base_spacing,
-    )
-
-    # Extract positions and adjust for level spacing
-    positions: Dict[int, np.ndarray] = {}
-    for nid in vertex_list:
-        pos = temp_graph.vertices[nid].get_center()
-        positions[nid] = np.array([pos[0], pos[1] * level_spacing / 2 + root_y, 0])
+    positions = compute_avl_positions(state, base_spacing, level_spacing, root_y)
 
     # Create node mobjects
     nodes_dict: Dict[int, VGroup] = {}
@@ -1603,52 +1961,76 @@ def animate_avl_transition(
     level_spacing: float = 1.2,
     root_y: float = 2.5,
     run_time: float = 0.6,
+    diff: Optional[AVLStateDiff] = None,
 ) -> Tuple[Dict[int, VGroup], Dict[Tuple[int, int], Line]]:
     """
     Animate transition between two AVL states using diff-based approach.
     
+    diff is the precomputed diff from old_state to new_state (e.g.
+    builder.last_diff); it is computed with diff_avl_states when omitted.
+    
     Returns:
         (new_nodes_dict, new_edges_dict)
     """
-    diff = diff_avl_states(old_state, new_state)
+    # Reset colors for all existing nodes (circle is at index [0])
+    _reset_shape_colors([node[0] for node in prev_nodes.values()], BLUE, 0.8, WHITE, stroke_width=2)
 
-    # Build target layout for new state
-    _, target_nodes, target_edges = build_avl_graph_from_state(
-        new_state, base_spacing, level_spacing, root_y
-    )
+    if diff is None:
+        diff = diff_avl_states(old_state, new_state)
+
+    # Nothing changed (duplicate insert, missing delete) - same layout, no animation
+    if not (diff.new_nodes or diff.removed_nodes or diff.modified_nodes or
+            diff.added_edges or diff.removed_edges):
+        return prev_nodes, prev_edges
+
+    # Target positions only - mobjects are built just for new/modified nodes
+    target_positions = compute_avl_positions(new_state, base_spacing, level_spacing, root_y)
 
     new_nodes_dict: Dict[int, VGroup] = {}
     new_edges_dict: Dict[Tuple[int, int], Line] = {}
     node_anims = []
     edge_anims = []
 
-    # Reset colors for all existing nodes (circle is at index [0])
-    for nid in prev_nodes:
-        prev_nodes[nid][0].set_fill(BLUE, opacity=0.8)
-        prev_nodes[nid][0].set_stroke(WHITE, width=2)
-
     # Handle unchanged nodes - move if position changed
-    for nid in diff.unchanged_nodes:
-        old_node = prev_nodes[nid]
-        target_pos = target_nodes[nid].get_center()
-        old_pos = old_node.get_center()
-
-        if not np.allclose(old_pos, target_pos, atol=0.01):
-            node_anims.append(old_node.animate.move_to(target_pos))
-
-        new_nodes_dict[nid] = old_node
-
-    # Handle modified nodes - Transform to update bf labels
+    unchanged = list(diff.unchanged_nodes)
+    for nid in unchanged:
+        new_nodes_dict[nid] = prev_nodes[nid]
+    if unchanged:
+        # One vectorized distance test (squared, vs 0.01 ** 2) instead of allclose per node
+        old_pos = np.array([prev_nodes[nid].get_center() for nid in unchanged])
+        new_pos = np.array([target_positions[nid] for nid in unchanged])
+        deltas = new_pos - old_pos
+        moved = np.flatnonzero((deltas * deltas).sum(axis=1) > 1e-4)
+        for i in moved:
+            node_anims.append(prev_nodes[unchanged[i]].animate.move_to(new_pos[i]))
+
+    # Handle modified nodes - most only changed balance/height (rebalancing),
+    # so move the circle and key and transform just the bf label
     for nid in diff.modified_nodes:
         old_node = prev_nodes[nid]
-        target_node = target_nodes[nid]
-
-        node_anims.append(Transform(old_node, target_node))
         new_nodes_dict[nid] = old_node
+        old_data = old_state.nodes[nid]
+        new_data = new_state.nodes[nid]
+        target_node = create_avl_node_mobject(new_data.key, new_data.balance, target_positions[nid])
+
+        if old_data.key != new_data.key:
+            node_anims.append(Transform(old_node, target_node))
+            continue
+
+        shift = target_node.get_center() - old_node.get_center()
+        moved = shift[0] * shift[0] + shift[1] * shift[1] + shift[2] * shift[2] > 1e-4
+        if moved:
+            node_anims.append(old_node[0].animate.shift(shift))
+            node_anims.append(old_node[1].animate.shift(shift))
+        if old_data.balance != new_data.balance:
+            node_anims.append(Transform(old_node[2], target_node[2]))
+        elif moved:
+            node_anims.append(old_node[2].animate.shift(shift))
 
     # Handle new nodes - FadeIn
     for nid in diff.new_nodes:
-        target_node = target_nodes[nid].copy()
+        new_data = new_state.nodes[nid]
+        target_node = create_avl_node_mobject(new_data.key, new_data.balance, target_positions[nid])
         new_nodes_dict[nid] = target_node
         node_anims.append(FadeIn(target_node))
 
@@ -1657,13 +2039,11 @@ def animate_avl_transition(
         old_node = prev_nodes[nid]
         node_anims.append(FadeOut(old_node))
 
-    # Handle edges
-    old_edge_keys = set(prev_edges.keys())
-    new_edge_keys = set(target_edges.keys())
-
-    kept_edges = old_edge_keys & new_edge_keys
-    added_edges = new_edge_keys - old_edge_keys
-    removed_edges = old_edge_keys - new_edge_keys
+    # Handle edges - the diff lists the edges that changed; every other
+    # edge on screen is kept
+    added_edges = diff.added_edges
+    removed_edges = diff.removed_edges
+    kept_edges = prev_edges.keys() - removed_edges
 
     # Kept edges - reattach updater
     for ek in kept_edges:
@@ -1694,9 +2074,6 @@ def animate_avl_transition(
 
     # Play all animations together
     if node_anims or edge_anims:
-        scene.play(
-            AnimationGroup(*node_anims, *edge_anims, lag_ratio=0.0),
-            run_time=run_time,
-        )
+        scene.play(*node_anims, *edge_anims, run_time=run_time)
 
     return new_nodes_dict, new_edges_dict
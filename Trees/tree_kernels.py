@@ -0,0 +1,573 @@
+"""
+Descent and layout kernels for the tree builders
+Array-only loops over the builders' array storage, JIT-compiled with
+Numba when it is installed
+"""
+
+import numpy as np
+
+try:
+    from numba import njit
+    HAVE_NUMBA = True
+except ImportError:  # Numba is optional - fall back to plain Python
+    HAVE_NUMBA = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+NIL = -1
+
+
+def as_int64(buf):
+    """
+    View an int64 buffer (e.g. array('q')) as a NumPy array for the kernels.
+
+    Without Numba the kernels run as plain Python, where indexing the
+    original buffer is faster than indexing NumPy scalars, so it is
+    returned unchanged. The view must not outlive the call it is passed
+    to, since an exported buffer cannot be resized.
+    """
+    if HAVE_NUMBA:
+        return np.frombuffer(buf, dtype=np.int64)
+    return buf
+
+
+@njit(cache=True)
+def bst_descent_path(root, keys, left, right, target):
+    """
+    Node ids visited walking from root towards target, stopping at the
+    node holding target or at the last node before a missing child.
+    """
+    path = np.empty(len(keys), np.int64)
+    count = 0
+    current = root
+    while current != NIL:
+        path[count] = current
+        count += 1
+        key = keys[current]
+        if target == key:
+            break
+        elif target < key:
+            current = left[current]
+        else:
+            current = right[current]
+    return path[:count]
+
+
+@njit(cache=True)
+def bst_find(root, keys, left, right, target):
+    """Node id holding target, or NIL if it is not in the tree."""
+    current = root
+    while current != NIL:
+        key = keys[current]
+        if target == key:
+            return current
+        elif target < key:
+            current = left[current]
+        else:
+            current = right[current]
+    return NIL
+
+
+@njit(cache=True)
+def _btree_bisect(keys, start, count, target):
+    """bisect_left over the count sorted keys starting at keys[start]; index within the node."""
+    lo = 0
+    hi = count
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if keys[start + mid] < target:
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+
+
+@njit(cache=True)
+def btree_descent_path(root, max_keys, keys, nkeys, children, nchildren,
+                       target, stop_on_match):
+    """
+    Node ids visited walking from root towards target in a B-tree stored
+    as fixed-stride rows: node i owns the nkeys[i] keys starting at
+    keys[i * (max_keys + 1)] and the nchildren[i] children starting at
+    children[i * (max_keys + 2)].
+
+    Stops at a leaf, or at the node containing target when stop_on_match.
+    """
+    key_stride = max_keys + 1
+    child_stride = max_keys + 2
+    path = np.empty(len(nkeys), np.int64)
+    count = 0
+    node = root
+    while True:
+        path[count] = node
+        count += 1
+
+        k_start = node * key_stride
+        idx = _btree_bisect(keys, k_start, nkeys[node], target)
+        if stop_on_match and idx < nkeys[node] and keys[k_start + idx] == target:
+            break
+        if idx >= nchildren[node]:
+            break
+        node = children[node * child_stride + idx]
+    return path[:count]
+
+
+@njit(cache=True)
+def _insert_at(values, start, count, pos, value):
+    """Insert value at values[start + pos], shifting the count - pos values after it right."""
+    for j in range(start + count, start + pos, -1):
+        values[j] = values[j - 1]
+    values[start + pos] = value
+
+
+@njit(cache=True)
+def _btree_split(node, new_id, max_keys, keys, nkeys, children, nchildren):
+    """
+    Split an overflowed node around its median: the node keeps the lower
+    half and row new_id takes the upper half. Returns the median key.
+    """
+    key_stride = max_keys + 1
+    child_stride = max_keys + 2
+    k_start = node * key_stride
+    mid = nkeys[node] // 2
+    mid_key = keys[k_start + mid]
+
+    n_right = nkeys[node] - mid - 1
+    for i in range(n_right):
+        keys[new_id * key_stride + i] = keys[k_start + mid + 1 + i]
+    nkeys[new_id] = n_right
+    nkeys[node] = mid
+
+    if nchildren[node] == 0:
+        nchildren[new_id] = 0
+    else:
+        c_start = node * child_stride
+        n_right = nchildren[node] - mid - 1
+        for i in range(n_right):
+            children[new_id * child_stride + i] = children[c_start + mid + 1 + i]
+        nchildren[new_id] = n_right
+        nchildren[node] = mid + 1
+    return mid_key
+
+
+@njit(cache=True)
+def _btree_insert(root, key, max_keys, n_nodes, keys, nkeys, children, nchildren,
+                  path_node, path_idx, touched):
+    """
+    btree_insert with caller-provided buffers: path_node and path_idx hold
+    one entry per level, touched three per level plus two. Returns
+    (root, leaf, n_nodes, count) with the touched ids in touched[:count].
+    """
+    key_stride = max_keys + 1
+    child_stride = max_keys + 2
+
+    # Descend to the leaf, remembering (parent, child index) at each level
+    depth = 0
+    node = root
+    while nchildren[node] > 0:
+        idx = _btree_bisect(keys, node * key_stride, nkeys[node], key)
+        path_node[depth] = node
+        path_idx[depth] = idx
+        depth += 1
+        node = children[node * child_stride + idx]
+
+    # Leaf node - insert here
+    k_start = node * key_stride
+    _insert_at(keys, k_start, nkeys[node], _btree_bisect(keys, k_start, nkeys[node], key), key)
+    nkeys[node] += 1
+    leaf = node
+    touched[0] = leaf
+    count = 1
+
+    # Walk back up, splitting any child that overflowed
+    for level in range(depth - 1, -1, -1):
+        parent = path_node[level]
+        idx = path_idx[level]
+        child = children[parent * child_stride + idx]
+        if nkeys[child] <= max_keys:
+            break
+        right = n_nodes
+        n_nodes += 1
+        mid_key = _btree_split(child, right, max_keys, keys, nkeys, children, nchildren)
+        _insert_at(keys, parent * key_stride, nkeys[parent], idx, mid_key)
+        nkeys[parent] += 1
+        _insert_at(children, parent * child_stride, nchildren[parent], idx + 1, right)
+        nchildren[parent] += 1
+        touched[count] = child
+        touched[count + 1] = right
+        touched[count + 2] = parent
+        count += 3
+
+    # Root overflowed - split it under a new root
+    if nkeys[root] > max_keys:
+        right = n_nodes
+        mid_key = _btree_split(root, right, max_keys, keys, nkeys, children, nchildren)
+        new_root = n_nodes + 1
+        n_nodes += 2
+        keys[new_root * key_stride] = mid_key
+        nkeys[new_root] = 1
+        children[new_root * child_stride] = root
+        children[new_root * child_stride + 1] = right
+        nchildren[new_root] = 2
+        touched[count] = root
+        touched[count + 1] = right
+        count += 2
+        root = new_root
+        touched[count] = root
+        count += 1
+
+    return root, leaf, n_nodes, count
+
+
+
+
+@njit(cache=True)
+def btree_insert(root, key, max_keys, n_nodes, keys, nkeys, children, nchildren):
+    """
+    Insert key into the B-tree stored as in btree_descent_path, splitting
+    overflowed nodes bottom-up. New nodes take rows n_nodes, n_nodes + 1,
+    ... so the arrays need one spare row per level plus one.
+
+    Returns (root, leaf, n_nodes, touched): the possibly new root, the
+    leaf that received key, the new node count, and ids of every node
+    whose row was written.
+    """
+    # Tree height, to size the path and touched buffers
+    height = 1
+    node = root
+    while nchildren[node] > 0:
+        node = children[node * (max_keys + 2)]
+        height += 1
+    path_node = np.empty(height, np.int64)
+    path_idx = np.empty(height, np.int64)
+    # The leaf, three rows per split, and a new root
+    touched = np.empty(3 * height + 2, np.int64)
+
+    root, leaf, n_nodes, count = _btree_insert(
+        root, key, max_keys, n_nodes, keys, nkeys, children, nchildren,
+        path_node, path_idx, touched,
+    )
+    return root, leaf, n_nodes, touched[:count]
+
+
+# Tallest tree btree_insert_many inserts into; sizes its path buffers
+BTREE_MAX_HEIGHT = 64
+
+
+@njit(cache=True)
+def btree_insert_many(root, height, new_keys, start, max_keys, n_nodes,
+                      keys, nkeys, children, nchildren, dirty):
+    """
+    Insert new_keys[start:] in order as repeated btree_insert calls would,
+    into a non-empty tree of the given height, setting dirty[i] = 1 for
+    every node i whose row was written.
+
+    Stops early, before a key, once the arrays have fewer than height + 1
+    spare rows or the tree is BTREE_MAX_HEIGHT levels tall, so the caller
+    can grow the arrays and call again. Returns (root, height, n_nodes,
+    done) where new_keys[done:] are still to be inserted.
+    """
+    path_node = np.empty(BTREE_MAX_HEIGHT, np.int64)
+    path_idx = np.empty(BTREE_MAX_HEIGHT, np.int64)
+    touched = np.empty(3 * BTREE_MAX_HEIGHT + 2, np.int64)
+    capacity = len(nkeys)
+    for i in range(start, len(new_keys)):
+        if n_nodes + height + 1 > capacity or height >= BTREE_MAX_HEIGHT:
+            return root, height, n_nodes, i
+        old_root = root
+        root, leaf, n_nodes, count = _btree_insert(
+            root, new_keys[i], max_keys, n_nodes, keys, nkeys, children, nchildren,
+            path_node, path_idx, touched,
+        )
+        if root != old_root:
+            height += 1
+        for j in range(count):
+            dirty[touched[j]] = 1
+    return root, height, n_nodes, len(new_keys)
+
+
+@njit(cache=True)
+def tree_layout(root, child_offsets, flat_children, out_x, out_depth):
+    """
+    Tree layout in slot units for a tree stored as ragged arrays: the
+    children of node i, left to right, are
+    flat_children[child_offsets[i]:child_offsets[i + 1]].
+
+    Leaves take the next free slot on their level and parents sit over the
+    mean of their children, sliding right with their subtree if that slot
+    is taken. Fills out_x and out_depth for every node under root.
+    """
+    n = len(child_offsets) - 1
+    obstruction = np.zeros(n + 1)   # next free x per depth
+    stack_node = np.empty(n, np.int64)
+    stack_next = np.empty(n, np.int64)  # next child slot to visit
+    queue = np.empty(n, np.int64)
+
+    # Iterative post-order; the stack height is the depth of the node on top
+    top = 0
+    stack_node[0] = root
+    stack_next[0] = child_offsets[root]
+    while top >= 0:
+        v = stack_node[top]
+        c = stack_next[top]
+        if c < child_offsets[v + 1]:
+            stack_next[top] = c + 1
+            child = flat_children[c]
+            top += 1
+            stack_node[top] = child
+            stack_next[top] = child_offsets[child]
+            continue
+
+        depth = top
+        top -= 1
+        out_depth[v] = depth
+        start = child_offsets[v]
+        end = child_offsets[v + 1]
+        if start == end:
+            x = obstruction[depth]
+            out_x[v] = x
+        else:
+            total = 0.0
+            for i in range(start, end):
+                total += out_x[flat_children[i]]
+            x = total / (end - start)
+            out_x[v] = x
+            free_x = obstruction[depth]
+            if x < free_x:
+                # Slide v and its descendants right, breadth first
+                dx = free_x - x
+                head = 0
+                tail = 1
+                queue[0] = v
+                while head < tail:
+                    u = queue[head]
+                    head += 1
+                    ux = out_x[u] + dx
+                    out_x[u] = ux
+                    d = out_depth[u]
+                    if ux + 1 > obstruction[d]:
+                        obstruction[d] = ux + 1
+                    for i in range(child_offsets[u], child_offsets[u + 1]):
+                        queue[tail] = flat_children[i]
+                        tail += 1
+                x = free_x
+        obstruction[depth] = x + 1
+
+
+# AVL rotation codes reported by avl_rebalance_path
+ROT_NONE = -1
+ROT_LL = 0
+ROT_RR = 1
+ROT_LR = 2
+ROT_RL = 3
+
+
+@njit(cache=True)
+def _avl_update(node, left, right, heights, balance):
+    """Recompute height and balance factor (height(left) - height(right)) of node."""
+    l = left[node]
+    r = right[node]
+    left_h = 0 if l == NIL else heights[l]
+    right_h = 0 if r == NIL else heights[r]
+    heights[node] = 1 + max(left_h, right_h)
+    balance[node] = left_h - right_h
+
+
+@njit(cache=True)
+def _avl_rotate_left(z, root, left, right, parent, heights, balance, touched, count):
+    r"""
+    Left rotation around z. Returns (y, root, count), recording touched ids.
+
+         z                y
+        / \              / \
+       T1  y    =>      z   T3
+          / \          / \
+         T2  T3       T1  T2
+    """
+    y = right[z]
+    t2 = left[y]
+    left[y] = z
+    right[z] = t2
+
+    p = parent[z]
+    parent[y] = p
+    parent[z] = y
+    if t2 != NIL:
+        parent[t2] = z
+        touched[count] = t2
+        count += 1
+
+    if p == NIL:
+        root = y
+    else:
+        if left[p] == z:
+            left[p] = y
+        else:
+            right[p] = y
+        touched[count] = p
+        count += 1
+
+    # z first, then y
+    _avl_update(z, left, right, heights, balance)
+    _avl_update(y, left, right, heights, balance)
+    touched[count] = z
+    touched[count + 1] = y
+    return y, root, count + 2
+
+
+@njit(cache=True)
+def _avl_rotate_right(z, root, left, right, parent, heights, balance, touched, count):
+    r"""
+    Right rotation around z. Returns (y, root, count), recording touched ids.
+
+         z                y
+        / \              / \
+       y   T3   =>      T1  z
+      / \                  / \
+     T1  T2               T2  T3
+    """
+    y = left[z]
+    t2 = right[y]
+    right[y] = z
+    left[z] = t2
+
+    p = parent[z]
+    parent[y] = p
+    parent[z] = y
+    if t2 != NIL:
+        parent[t2] = z
+        touched[count] = t2
+        count += 1
+
+    if p == NIL:
+        root = y
+    else:
+        if left[p] == z:
+            left[p] = y
+        else:
+            right[p] = y
+        touched[count] = p
+        count += 1
+
+    _avl_update(z, left, right, heights, balance)
+    _avl_update(y, left, right, heights, balance)
+    touched[count] = z
+    touched[count + 1] = y
+    return y, root, count + 2
+
+
+@njit(cache=True)
+def avl_rebalance_path(start, root, left, right, parent, heights, balance):
+    """
+    Walk up from start to the root, updating heights and balance factors
+    and rotating any unbalanced node, in place.
+
+    Returns (root, touched, pivot, child, grandchild, rotation): the
+    possibly new root, ids of every node whose fields were written, and the
+    first rotation performed (rotation is ROT_NONE if there was none;
+    grandchild is NIL for single rotations).
+    """
+    # Each level updates one node and a double rotation touches 8 more
+    bound = 0 if root == NIL else 9 * (heights[root] + 2)
+    touched = np.empty(bound, np.int64)
+    count = 0
+    pivot = NIL
+    child = NIL
+    grandchild = NIL
+    rotation = ROT_NONE
+
+    current = start
+    while current != NIL:
+        _avl_update(current, left, right, heights, balance)
+        touched[count] = current
+        count += 1
+        bal = balance[current]
+
+        if bal > 1:
+            # Left-heavy
+            l = left[current]
+            if balance[l] >= 0:
+                # LL case - single right rotation
+                if rotation == ROT_NONE:
+                    pivot = current
+                    child = l
+                    rotation = ROT_LL
+            else:
+                # LR case - left rotation on left child, then right rotation
+                if rotation == ROT_NONE:
+                    pivot = current
+                    child = l
+                    grandchild = right[l]
+                    rotation = ROT_LR
+                _, root, count = _avl_rotate_left(l, root, left, right, parent, heights, balance, touched, count)
+            current, root, count = _avl_rotate_right(current, root, left, right, parent, heights, balance, touched, count)
+
+        elif bal < -1:
+            # Right-heavy
+            r = right[current]
+            if balance[r] <= 0:
+                # RR case - single left rotation
+                if rotation == ROT_NONE:
+                    pivot = current
+                    child = r
+                    rotation = ROT_RR
+            else:
+                # RL case - right rotation on right child, then left rotation
+                if rotation == ROT_NONE:
+                    pivot = current
+                    child = r
+                    grandchild = left[r]
+                    rotation = ROT_RL
+                _, root, count = _avl_rotate_right(r, root, left, right, parent, heights, balance, touched, count)
+            current, root, count = _avl_rotate_left(current, root, left, right, parent, heights, balance, touched, count)
+
+        # Move up to parent
+        current = parent[current]
+
+    return root, touched[:count], pivot, child, grandchild, rotation
+
+
+def warm_up():
+    """
+    Compile every kernel once on a tiny tree so Numba's on-disk cache is
+    filled before the first render: python -m Trees.tree_kernels
+    Argument types match the builders' calls, so later runs load the
+    cached machine code instead of compiling. A no-op without Numba.
+    """
+    if not HAVE_NUMBA:
+        return
+    # Node 0 holds 2 with children 1 and 3 (nodes 1 and 2)
+    keys = np.array([2, 1, 3], np.int64)
+    left = np.array([1, NIL, NIL], np.int64)
+    right = np.array([2, NIL, NIL], np.int64)
+    parent = np.array([NIL, 0, 0], np.int64)
+    heights = np.array([2, 1, 1], np.int64)
+    balance = np.zeros(3, np.int64)
+    bst_descent_path(0, keys, left, right, 3)
+    bst_find(0, keys, left, right, 3)
+    avl_rebalance_path(1, 0, left, right, parent, heights, balance)
+
+    # Order-3 B-tree rows (3 key and 4 child slots each): root [2] over
+    # leaves [1] and [3], plus spare rows for splits
+    btree_keys = np.zeros(18, np.int64)
+    btree_keys[[0, 3, 6]] = [2, 1, 3]
+    btree_nkeys = np.array([1, 1, 1, 0, 0, 0], np.int64)
+    btree_children = np.zeros(24, np.int64)
+    btree_children[:2] = [1, 2]
+    btree_nchildren = np.array([2, 0, 0, 0, 0, 0], np.int64)
+    btree_descent_path(0, 2, btree_keys, btree_nkeys, btree_children, btree_nchildren, 3, True)
+    btree_insert(0, 4, 2, 3, btree_keys, btree_nkeys, btree_children, btree_nchildren)
+    btree_insert_many(0, 2, np.array([5], np.int64), 0, 2, 3, btree_keys, btree_nkeys,
+                      btree_children, btree_nchildren, np.zeros(6, np.int64))
+
+    # The layout kernel takes children as ragged arrays
+    child_offsets = np.array([0, 2, 2, 2], np.int64)
+    flat_children = np.array([1, 2], np.int64)
+    tree_layout(0, child_offsets, flat_children, np.zeros(3), np.zeros(3, np.int64))
+
+
+if __name__ == "__main__":
+    warm_up()
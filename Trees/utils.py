@@ -3,6 +3,9 @@ Shared utilities for tree visualizations
 Provides common functions for creating nodes, edges, and configuring scenes
 """
 
+from functools import lru_cache
+import math
+
 from manim import *
 import numpy as np
 
@@ -61,12 +64,12 @@ def create_circular_node(value, position, color=BLUE, radius=0.4, font_size=24,
         VGroup containing the circle and text
     """
     circle = Circle(radius=radius, color=color, fill_opacity=fill_opacity, fill_color=color, stroke_width=stroke_width)
-    text = Text(str(value), font_size=font_size, color=WHITE, disable_ligatures=True)
+    text = make_text(str(value), font_size=font_size, color=WHITE, disable_ligatures=True)
     node = VGroup(circle, text).move_to(position)
     return node
 
 
-def create_edge_circular_nodes(node1, node2, radius=0.4, stroke_width=3, color=WHITE):
+def create_edge_circular_nodes(node1, node2, radius=0.4, stroke_width=3, color=WHITE, line=None):
     """
     Create an edge connecting two circular nodes at their boundaries
     
@@ -76,6 +79,7 @@ def create_edge_circular_nodes(node1, node2, radius=0.4, stroke_width=3, color=W
         radius: Radius of the circular nodes (default: 0.4)
         stroke_width: Width of the edge line (default: 3)
         color: Color of the edge (default: WHITE)
+        line: Optional existing Line to reposition instead of allocating a new one
     
     Returns:
         Line object connecting the nodes at their boundaries
@@ -83,17 +87,22 @@ def create_edge_circular_nodes(node1, node2, radius=0.4, stroke_width=3, color=W
     center1 = node1.get_center()
     center2 = node2.get_center()
     
-    # Calculate direction vector
+    # Calculate direction vector (hypot on floats skips np.linalg.norm's dispatch)
     direction = center2 - center1
-    if np.linalg.norm(direction) == 0:
+    length = math.hypot(*direction.tolist())
+    if length == 0:
         return Line(center1, center2, stroke_width=stroke_width, color=color)
     
-    direction_normalized = direction / np.linalg.norm(direction)
+    # Boundary offset shared by both endpoints
+    offset = direction * (radius / length)
     
     # Calculate edge points on circle boundaries
-    start_point = center1 + direction_normalized * radius
-    end_point = center2 - direction_normalized * radius
+    start_point = center1 + offset
+    end_point = center2 - offset
     
+    if line is not None:
+        line.set_stroke(color, width=stroke_width)
+        return line.put_start_and_end_on(start_point, end_point)
     return Line(start_point, end_point, stroke_width=stroke_width, color=color)
 
 
@@ -116,12 +125,13 @@ def create_edge_rectangular_nodes(parent_node, child_node, stroke_width=2, color
     parent_center = parent_rect.get_center()
     child_center = child_rect.get_center()
     
-    # Calculate direction
+    # Calculate direction, measuring its length once
     direction = child_center - parent_center
-    if np.linalg.norm(direction) == 0:
+    length = math.hypot(*direction.tolist())
+    if length == 0:
         return Line(parent_center, child_center, stroke_width=stroke_width, color=color)
     
-    direction_normalized = direction / np.linalg.norm(direction)
+    direction_normalized = direction / length
     
     # Get rectangle dimensions (scaling is already applied to the rectangle)
     parent_height = parent_rect.get_height()
@@ -134,6 +144,31 @@ def create_edge_rectangular_nodes(parent_node, child_node, stroke_width=2, color
     return Line(parent_edge, child_edge, stroke_width=stroke_width, color=color)
 
 
+@lru_cache(maxsize=1024)
+def _proto_text(text, font_size, color_hex, disable_ligatures):
+    """Shape and rasterize a Text once; callers get copies via make_text"""
+    return Text(text, font_size=font_size, color=color_hex, disable_ligatures=disable_ligatures)
+
+
+def make_text(text, font_size=24, color=WHITE, disable_ligatures=False):
+    """
+    Create a Text mobject from a cached prototype
+    
+    Repeated labels (titles, property lines, node keys) skip Pango shaping and SVG
+    parsing after the first call; each call still returns an independent copy.
+    
+    Args:
+        text: Text to display
+        font_size: Font size (default: 24)
+        color: Text color (default: WHITE)
+        disable_ligatures: Passed through to Text (default: False)
+    
+    Returns:
+        Text object
+    """
+    return _proto_text(text, font_size, str(color), disable_ligatures).copy()
+
+
 def create_title(title_text, font_size=48):
     """
     Create a title text positioned at the top edge
@@ -145,7 +180,7 @@ def create_title(title_text, font_size=48):
     Returns:
         Text object positioned at the top edge
     """
-    return Text(title_text, font_size=font_size, disable_ligatures=True).to_edge(UP)
+    return make_text(title_text, font_size=font_size, disable_ligatures=True).to_edge(UP)
 
 
 def create_edge_from_positions(pos1, pos2, radius=0.4, stroke_width=3, color=WHITE):
@@ -165,12 +200,13 @@ def create_edge_from_positions(pos1, pos2, radius=0.4, stroke_width=3, color=WHI
     pos1 = np.array(pos1)
     pos2 = np.array(pos2)
     
-    # Calculate direction vector
+    # Calculate direction vector, measuring its length once
     direction = pos2 - pos1
-    if np.linalg.norm(direction) == 0:
+    length = math.hypot(*direction.tolist())
+    if length == 0:
         return Line(pos1, pos2, stroke_width=stroke_width, color=color)
     
-    direction_normalized = direction / np.linalg.norm(direction)
+    direction_normalized = direction / length
     
     # Calculate edge points offset by radius
     start_point = pos1 + direction_normalized * radius
@@ -193,7 +229,7 @@ def calculate_binary_tree_position(parent_pos, level, is_left, base_spacing=2.0,
     Returns:
         numpy array representing the new position
     """
-    spacing = base_spacing / (2 ** level)
+    spacing = base_spacing / (1 << level)
     direction = LEFT if is_left else RIGHT
     new_pos = parent_pos + direction * spacing + DOWN * level_spacing
     return np.array(new_pos)
@@ -212,9 +248,10 @@ def calculate_tree_level_position(idx, base_y=2.0, level_spacing=1.3, horizontal
     Returns:
         numpy array representing the position
     """
-    level = int(np.log2(idx + 1))
-    pos_in_level = idx - (2 ** level - 1)
-    total_in_level = 2 ** level
+    # Integer log2 without a float round trip through NumPy
+    level = (idx + 1).bit_length() - 1
+    total_in_level = 1 << level
+    pos_in_level = idx - (total_in_level - 1)
     x_offset = (pos_in_level - total_in_level / 2 + 0.5) * horizontal_spacing
     y_pos = base_y - level * level_spacing
     return np.array([x_offset, y_pos, 0])
@@ -0,0 +1,55 @@
+"""
+BTreeBuilder.insert_many must build the same tree as per-key inserts
+"""
+
+import random
+
+import pytest
+
+pytest.importorskip("manim")
+
+from Trees.tree_builder import BTreeBuilder, diff_btree_states
+from Trees.tree_kernels import BTREE_MAX_HEIGHT
+
+
+def _shape(state):
+    return state.root_id, {nid: (node.keys, node.children) for nid, node in state.nodes.items()}
+
+
+@pytest.mark.parametrize("order", [2, 3, 4, 5, 8])
+def test_insert_many_matches_insert_and_snapshot(order):
+    rng = random.Random(order)
+    batched = BTreeBuilder(order)
+    single = BTreeBuilder(order)
+    for _ in range(5):
+        # Small key range so duplicates show up too
+        keys = [rng.randint(0, 300) for _ in range(rng.randint(0, 400))]
+        for key in keys:
+            expected, _ = single.insert_and_snapshot(key)
+        state = batched.insert_many(keys)
+        if keys:
+            assert _shape(state) == _shape(expected)
+        for target in range(-1, 302, 7):
+            assert batched.search_path(target) == single.search_path(target)
+
+
+def test_insert_many_diff_covers_whole_run():
+    builder = BTreeBuilder(3)
+    prev, _ = builder.insert_and_snapshot(50)
+    state = builder.insert_many(range(10, 40))
+    diff = builder.last_diff
+    expected = diff_btree_states(prev, state)
+    assert diff.new_nodes == expected.new_nodes
+    assert diff.modified_nodes == expected.modified_nodes
+    assert diff.unchanged_nodes == expected.unchanged_nodes
+    assert diff.added_edges == expected.added_edges
+    assert diff.removed_edges == expected.removed_edges
+
+
+def test_insert_many_stops_at_max_height():
+    # Order 2 leaves empty nodes behind and grows tall quickly
+    builder = BTreeBuilder(2)
+    keys = random.Random(0).sample(range(10 ** 6), 100000)
+    with pytest.raises(ValueError):
+        builder.insert_many(keys)
+    assert builder._height == BTREE_MAX_HEIGHT